@@ -0,0 +1,51 @@
+import argparse
+import time
+
+from linear_structures import (DoublyLinkedList, IndexedArray, LinearDataStructure, Queue, SinglyLinkedList,
+                               TypedIndexedArray)
+
+STRUCTURES = {
+    'IndexedArray': IndexedArray,
+    'TypedIndexedArray': lambda: TypedIndexedArray('q'),
+    'Queue': Queue,
+    'SinglyLinkedList': SinglyLinkedList,
+    'DoublyLinkedList': DoublyLinkedList,
+}
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-item path versus bulk overrides')
+    parser.add_argument('-n', '--size', type=int, default=1000000)
+    # the per-item removal path is quadratic, so it gets a smaller default
+    parser.add_argument('-r', '--remove-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    items = list(range(args.size))
+    print(f"{'structure':<18} {'insert_end loop':>16} {'extend':>9} {'speedup':>8}   ({args.size} items)")
+    for name, factory in STRUCTURES.items():
+        # LinearDataStructure.extend is the generic one-insert_end-per-item path
+        per_item = timed(LinearDataStructure.extend, factory(), items)
+        bulk = timed(factory().extend, items)
+        print(f"{name:<18} {per_item:>15.3f}s {bulk:>8.3f}s {per_item / bulk:>7.1f}x")
+
+    items = list(range(args.remove_size))
+    half = args.remove_size // 2
+    print(f"\n{'structure':<18} {'remove_at loop':>16} {'remove_range':>13} {'speedup':>8}   (remove {half} from the middle)")
+    for name, factory in STRUCTURES.items():
+        structure = factory()
+        structure.extend(items)
+        per_item = timed(LinearDataStructure.remove_range, structure, half // 2, half // 2 + half)
+        structure = factory()
+        structure.extend(items)
+        bulk = timed(structure.remove_range, half // 2, half // 2 + half)
+        print(f"{name:<18} {per_item:>15.3f}s {bulk:>12.3f}s {per_item / bulk:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
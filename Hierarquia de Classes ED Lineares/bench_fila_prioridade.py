@@ -0,0 +1,59 @@
+import argparse
+import random
+import time
+
+from fila_prioridade import FilaDePrioridade
+
+
+def _cronometrar(funcao):
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+
+def remover_e_reinserir(n, operacoes, semente):
+    # abordagem anterior: busca linear pelo item, remoção e nova inserção ordenada
+    gerador = random.Random(semente)
+    fila = FilaDePrioridade(range(n))
+    lista = fila._lista
+    itens = list(range(n))
+
+    def executar():
+        for _ in range(operacoes):
+            posicao = gerador.randrange(n)
+            lista.remove_key(itens[posicao])
+            itens[posicao] = gerador.random() * n
+            lista.insert_ordered(itens[posicao])
+
+    return _cronometrar(executar)
+
+
+def por_referencia(n, operacoes, semente, modo):
+    gerador = random.Random(semente)
+    fila = FilaDePrioridade(modo=modo)
+    referencias = [fila.inserir(item) for item in range(n)]
+
+    def executar():
+        for _ in range(operacoes):
+            fila.atualizar_prioridade(referencias[gerador.randrange(n)], gerador.random() * n)
+
+    return _cronometrar(executar)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Atualização de prioridade: referência x remover e reinserir")
+    parser.add_argument("-n", "--tamanhos", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("-o", "--operacoes", type=int, default=1000)
+    parser.add_argument("-s", "--semente", type=int, default=0)
+    argumentos = parser.parse_args()
+
+    print(f"{'n':>8} {'remover+reinserir':>18} {'lista (ref)':>12} {'heap (ref)':>12}   ({argumentos.operacoes} atualizações)")
+    for n in argumentos.tamanhos:
+        antigo = remover_e_reinserir(n, argumentos.operacoes, argumentos.semente)
+        lista = por_referencia(n, argumentos.operacoes, argumentos.semente, "lista")
+        heap = por_referencia(n, argumentos.operacoes, argumentos.semente, "heap")
+        print(f"{n:>8} {antigo:>17.4f}s {lista:>11.4f}s {heap:>11.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import random
+import time
+
+from linear_structures import DoublyLinkedList, IndexedArray, Queue, SinglyLinkedList
+
+STRUCTURES = {
+    'IndexedArray': IndexedArray,
+    'Queue': Queue,
+    'SinglyLinkedList': SinglyLinkedList,
+    'DoublyLinkedList': DoublyLinkedList,
+}
+
+
+def time_lookups(structure, keys):
+    start = time.perf_counter()
+    for key in keys:
+        structure.find_key(key)
+    return (time.perf_counter() - start) / len(keys)
+
+
+def measure(cls, size, lookups, rng):
+    structure = cls(range(size))
+    keys = [rng.randrange(size) for _ in range(lookups)]
+    scan = time_lookups(structure, keys)
+    start = time.perf_counter()
+    structure.enable_index()
+    build = time.perf_counter() - start
+    indexed = time_lookups(structure, keys)
+    # lookups needed before building the index pays for itself
+    saving = scan - indexed
+    break_even = build / saving if saving > 0 else float('inf')
+    return scan, build, indexed, break_even
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keyed lookup cost with the index off and on')
+    parser.add_argument('-n', '--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument('-l', '--lookups', type=int, default=200)
+    parser.add_argument('-s', '--structures', nargs='+', choices=sorted(STRUCTURES), default=list(STRUCTURES))
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'structure':<18} {'size':>8} {'scan/lookup':>12} {'index build':>12} "
+          f"{'indexed/lookup':>15} {'break-even':>11}")
+    for name in args.structures:
+        for size in args.sizes:
+            scan, build, indexed, break_even = measure(STRUCTURES[name], size, args.lookups, rng)
+            print(f"{name:<18} {size:>8} {scan * 1e6:>10.2f}us {build * 1e3:>10.3f}ms "
+                  f"{indexed * 1e6:>13.2f}us {break_even:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
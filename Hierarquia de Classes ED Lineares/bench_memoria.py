@@ -0,0 +1,91 @@
+import argparse
+import tracemalloc
+from contextlib import contextmanager
+
+import linear_structures
+import simple_circular_list
+from linear_structures import DoublyLinkedList, IndexedArray, Queue, SinglyLinkedList, TypedIndexedArray
+from simple_circular_list import SimpleCircularList
+
+
+# node layout before __slots__: same attributes, stored in a per-instance __dict__
+class DictSinglyNode:
+    def __init__(self, data):
+        self.data = data
+        self.next = None
+
+
+class DictDoublyNode:
+    def __init__(self, data):
+        self.data = data
+        self.next = None
+        self.prev = None
+
+
+class DictCircularNode:
+    def __init__(self, data):
+        self.data = data
+        self.next = None
+
+
+@contextmanager
+def dict_nodes():
+    saved = (linear_structures.SinglyLinkedListNode, linear_structures.DoublyLinkedListNode,
+             simple_circular_list.CircularNode)
+    linear_structures.SinglyLinkedListNode = DictSinglyNode
+    linear_structures.DoublyLinkedListNode = DictDoublyNode
+    simple_circular_list.CircularNode = DictCircularNode
+    try:
+        yield
+    finally:
+        (linear_structures.SinglyLinkedListNode, linear_structures.DoublyLinkedListNode,
+         simple_circular_list.CircularNode) = saved
+
+
+def build_circular(items):
+    structure = SimpleCircularList(len(items))
+    for item in items:
+        structure.insert(item)
+    return structure
+
+
+BUILDERS = {
+    'SinglyLinkedList': SinglyLinkedList,
+    'DoublyLinkedList': DoublyLinkedList,
+    'SimpleCircularList': build_circular,
+    'IndexedArray': IndexedArray,
+    'Queue': Queue,
+    "TypedIndexedArray('i')": lambda items: TypedIndexedArray('i', items),
+}
+NODE_BASED = ('SinglyLinkedList', 'DoublyLinkedList', 'SimpleCircularList')
+
+
+def bytes_per_element(builder, items):
+    # the items already exist, so only the structure's own allocations are counted
+    tracemalloc.start()
+    structure = builder(items)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del structure
+    return used / len(items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bytes per element of each structure (tracemalloc)')
+    parser.add_argument('-n', '--size', type=int, default=100000)
+    args = parser.parse_args()
+
+    items = list(range(args.size))
+    print(f"{'structure':<24} {'dict nodes':>11} {'current':>9}   ({args.size} ints)")
+    for name, builder in BUILDERS.items():
+        current = bytes_per_element(builder, items)
+        if name in NODE_BASED:
+            with dict_nodes():
+                before = f"{bytes_per_element(builder, items):>11.1f}"
+        else:
+            before = f"{'-':>11}"
+        print(f"{name:<24} {before} {current:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
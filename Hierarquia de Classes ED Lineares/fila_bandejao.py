@@ -17,6 +17,7 @@ class UsuarioFila:
 class FilaBandejao:
     def __init__(self, tempo_medio_atendimento_min=5):
         self.fila = Queue()
+        self.fila.enable_index(key=lambda usuario: usuario.nome)
         self.tempo_medio_atendimento = timedelta(minutes=tempo_medio_atendimento_min)
 
     def tamanho(self):
@@ -34,15 +35,14 @@ class FilaBandejao:
         self.fila.insert_end(usuario)
 
     def desistir(self, nome_usuario):
-        nova_fila = Queue()
         ajusta = False
-        while not self.fila.is_empty():
-            usuario = self.fila.remove_start()
-            if usuario.nome == nome_usuario:
-                ajusta = True
-                continue
-            nova_fila.insert_end(usuario)
-        self.fila = nova_fila
+        while True:
+            try:
+                posicao = self.fila.find_index_of_key(nome_usuario)
+            except ValueError:
+                break
+            self.fila.remove_at(posicao)
+            ajusta = True
         if ajusta:
             self._atualizar_tempos()
 
@@ -56,21 +56,9 @@ class FilaBandejao:
 
     def _atualizar_tempos(self):
         now = datetime.now()
-        temp_fila = []
-        while not self.fila.is_empty():
-            temp_fila.append(self.fila.remove_start())
-        for i, usuario in enumerate(temp_fila):
+        for i, usuario in enumerate(self.fila):
             usuario.tempo_restante = self.tempo_medio_atendimento * i
             usuario.hora_prevista_retirada = now + usuario.tempo_restante
-            self.fila.insert_end(usuario)
 
     def visualizar_fila(self):
-        usuarios = []
-        temp_fila = []
-        while not self.fila.is_empty():
-            usuario = self.fila.remove_start()
-            usuarios.append(usuario)
-            temp_fila.append(usuario)
-        for usuario in temp_fila:
-            self.fila.insert_end(usuario)
-        return usuarios
+        return list(self.fila)
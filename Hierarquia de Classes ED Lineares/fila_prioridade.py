@@ -1,10 +1,19 @@
-from linear_structures import DoublyLinkedList
+from linear_structures import DoublyLinkedList, DoublyLinkedListNode, merge_sort_nodes
+
+class NoFila(DoublyLinkedListNode):
+    # nó devolvido como referência: guarda a lista dona enquanto estiver nela
+    __slots__ = ('lista',)
+
+    def __init__(self, data, lista):
+        super().__init__(data)
+        self.lista = lista
+
 
 class DoublyLinkedListExtended(DoublyLinkedList):
     def __init__(self, iterable=None):
         super().__init__(iterable)
         if iterable is not None:
-            self.bubble_sort()
+            self.merge_sort()
 
     def push(self, item):
         self.insert_start(item)
@@ -42,70 +51,262 @@ class DoublyLinkedListExtended(DoublyLinkedList):
         current.data, current.next.data = current.next.data, current.data
 
     def bubble_sort(self):
-        n = self.length()
-        if n < 2:
+        self.merge_sort()
+
+    def merge_sort(self, key=None, reverse=False):
+        if self.size < 2:
             return
-        for _ in range(n):
-            swapped = False
-            current = self.head
-            while current and current.next:
-                if current.data > current.next.data:
-                    current.data, current.next.data = current.next.data, current.data
-                    swapped = True
-                current = current.next
-            if not swapped:
-                break
+        self.head, self.tail = merge_sort_nodes(self.head, key, reverse)
+        self._modcount += 1
+        prev = None
+        current = self.head
+        while current:
+            current.prev = prev
+            prev = current
+            current = current.next
 
     def insert_ordered(self, item):
-        new_node = self._create_node(item)
-        if self.head is None:
-            self.head = new_node
-            self.tail = new_node
-            return
         current = self.head
         while current and current.data < item:
             current = current.next
-        if current is None:
-            self.tail.next = new_node
-            new_node.prev = self.tail
-            self.tail = new_node
-        elif current == self.head:
-            new_node.next = self.head
-            self.head.prev = new_node
-            self.head = new_node
+        new_node = NoFila(item, self)
+        self._link_before(current, new_node)
+        return new_node
+
+    def reposition(self, node, item):
+        # troca o dado do nó e o recoloca, procurando a partir dos vizinhos
+        anterior = node.prev
+        seguinte = node.next
+        self._unlink(node)
+        node.data = item
+        node.lista = self
+        if anterior is not None and not anterior.data < item:
+            while anterior and not anterior.data < item:
+                anterior = anterior.prev
+            self._link_before(anterior.next if anterior else self.head, node)
         else:
-            prev_node = current.prev
-            prev_node.next = new_node
-            new_node.prev = prev_node
-            new_node.next = current
-            current.prev = new_node
+            while seguinte and seguinte.data < item:
+                seguinte = seguinte.next
+            self._link_before(seguinte, node)
+
+    def _unlink(self, node):
+        data = super()._unlink(node)
+        if isinstance(node, NoFila):
+            node.lista = None
+        return data
+
+    def remove_range(self, start, stop):
+        self._check_range(start, stop)
+        node = self._node_at(start) if start < stop else None
+        for _ in range(stop - start):
+            if isinstance(node, NoFila):
+                node.lista = None
+            node = node.next
+        super().remove_range(start, stop)
+
+    def clear(self):
+        for node in self._nodes():
+            if isinstance(node, NoFila):
+                node.lista = None
+        super().clear()
+
+    def _nodes(self):
+        node = self.head
+        while node:
+            yield node
+            node = node.next
+
+    def remove_node(self, node):
+        return self._unlink(node)
+
+    def owns(self, node):
+        return isinstance(node, NoFila) and node.lista is self
+
+
+class EntradaFila:
+    __slots__ = ('prioridade', 'ordem', 'item', 'posicao')
+
+    def __init__(self, prioridade, ordem, item):
+        self.prioridade = prioridade
+        self.ordem = ordem
+        self.item = item
+        self.posicao = None
+
+    def precede(self, other):
+        # maior prioridade primeiro; em empate, quem entrou antes
+        if other.prioridade < self.prioridade:
+            return True
+        if self.prioridade < other.prioridade:
+            return False
+        return self.ordem < other.ordem
+
+
+class HeapDePrioridade:
+    def __init__(self, iterable=None, chave=None):
+        self._chave = chave
+        self._contador = 0
+        self._heap = []
+        if iterable is not None:
+            for item in iterable:
+                entrada = self._nova_entrada(item)
+                entrada.posicao = len(self._heap)
+                self._heap.append(entrada)
+            for i in range(len(self._heap) // 2 - 1, -1, -1):
+                self._descer(i)
 
-    def _create_node(self, item):
-        from linear_structures import DoublyLinkedListNode
-        return DoublyLinkedListNode(item)
+    def _nova_entrada(self, item):
+        prioridade = item if self._chave is None else self._chave(item)
+        entrada = EntradaFila(prioridade, self._contador, item)
+        self._contador += 1
+        return entrada
+
+    def _subir(self, i):
+        heap = self._heap
+        entrada = heap[i]
+        while i > 0:
+            pai = (i - 1) // 2
+            if not entrada.precede(heap[pai]):
+                break
+            heap[i] = heap[pai]
+            heap[i].posicao = i
+            i = pai
+        heap[i] = entrada
+        entrada.posicao = i
+
+    def _descer(self, i):
+        heap = self._heap
+        n = len(heap)
+        entrada = heap[i]
+        while True:
+            filho = 2 * i + 1
+            if filho >= n:
+                break
+            direito = filho + 1
+            if direito < n and heap[direito].precede(heap[filho]):
+                filho = direito
+            if not heap[filho].precede(entrada):
+                break
+            heap[i] = heap[filho]
+            heap[i].posicao = i
+            i = filho
+        heap[i] = entrada
+        entrada.posicao = i
+
+    def inserir(self, item):
+        entrada = self._nova_entrada(item)
+        entrada.posicao = len(self._heap)
+        self._heap.append(entrada)
+        self._subir(entrada.posicao)
+        return entrada
+
+    def remover_maior(self):
+        if not self._heap:
+            raise IndexError("Heap vazio")
+        return self._remover_posicao(0).item
+
+    def _remover_posicao(self, i):
+        heap = self._heap
+        entrada = heap[i]
+        ultimo = heap.pop()
+        if ultimo is not entrada:
+            heap[i] = ultimo
+            ultimo.posicao = i
+            self._subir(i)
+            self._descer(ultimo.posicao)
+        entrada.posicao = None
+        return entrada
+
+    def _validar(self, entrada):
+        i = entrada.posicao
+        if i is None or i >= len(self._heap) or self._heap[i] is not entrada:
+            raise ValueError("Referência inválida para este heap")
+
+    def atualizar(self, entrada, nova_prioridade):
+        # sem função chave a prioridade é o próprio item
+        self._validar(entrada)
+        if self._chave is None:
+            entrada.item = nova_prioridade
+        entrada.prioridade = nova_prioridade
+        # como remover e reinserir: vai para o fim da fila entre os empatados
+        entrada.ordem = self._contador
+        self._contador += 1
+        self._subir(entrada.posicao)
+        self._descer(entrada.posicao)
+
+    def remover(self, entrada):
+        self._validar(entrada)
+        return self._remover_posicao(entrada.posicao).item
+
+    def consultar_maior(self):
+        if not self._heap:
+            raise IndexError("Heap vazio")
+        return self._heap[0].item
+
+    def esta_vazio(self):
+        return len(self._heap) == 0
+
+    def tamanho(self):
+        return len(self._heap)
+
+    def __str__(self):
+        ordenadas = sorted(self._heap, key=lambda e: (e.prioridade, -e.ordem), reverse=True)
+        return "[" + ", ".join(str(e.item) for e in ordenadas) + "]"
 
 
 class FilaDePrioridade:
-    def __init__(self, iterable=None):
+    def __init__(self, iterable=None, modo="lista", chave=None):
+        if modo not in ("lista", "heap"):
+            raise ValueError("Modo deve ser 'lista' ou 'heap'")
+        if chave is not None and modo != "heap":
+            raise ValueError("Função chave só é suportada no modo 'heap'")
+        self._modo = modo
+        if modo == "heap":
+            self._heap = HeapDePrioridade(iterable, chave)
+            return
         self._lista = DoublyLinkedListExtended()
         if iterable is not None:
             for item in iterable:
                 self._lista.insert_ordered(item)
 
     def inserir(self, item):
-        self._lista.insert_ordered(item)
+        if self._modo == "heap":
+            return self._heap.inserir(item)
+        return self._lista.insert_ordered(item)
+
+    def atualizar_prioridade(self, referencia, nova):
+        if self._modo == "heap":
+            self._heap.atualizar(referencia, nova)
+            return
+        if not self._lista.owns(referencia):
+            raise ValueError("Referência inválida para esta fila")
+        self._lista.reposition(referencia, nova)
+
+    def remover(self, referencia):
+        if self._modo == "heap":
+            return self._heap.remover(referencia)
+        if not self._lista.owns(referencia):
+            raise ValueError("Referência inválida para esta fila")
+        return self._lista.remove_node(referencia)
 
     def remover_maior_prioridade(self):
         if self.esta_vazia():
             raise IndexError("Fila vazia")
+        if self._modo == "heap":
+            return self._heap.remover_maior()
         # maior prioridade no fim da lista ordenada crescente
         return self._lista.pop_back()
 
     def esta_vazia(self):
+        if self._modo == "heap":
+            return self._heap.esta_vazio()
         return self._lista.is_empty()
 
     def tamanho(self):
+        if self._modo == "heap":
+            return self._heap.tamanho()
         return self._lista.length()
 
     def __str__(self):
+        if self._modo == "heap":
+            return str(self._heap)
         return str(self._lista)
@@ -1,7 +1,13 @@
 from abc import ABC, abstractmethod
+from array import array
 import math
 
 class LinearDataStructure(ABC):
+    _index = None
+    _index_key = None
+    _index_dirty = False
+    _modcount = 0
+
     def __init__(self, iterable=None):
         self.data = []
         if iterable is not None:
@@ -17,6 +23,104 @@ class LinearDataStructure(ABC):
     def is_full(self):
         return False
 
+    def __len__(self):
+        return self.length()
+
+    def __iter__(self):
+        modcount = self._modcount
+        for i in range(self.length()):
+            self._check_not_modified(modcount)
+            yield self.find_at(i)
+        self._check_not_modified(modcount)
+
+    def __contains__(self, item):
+        # membership is about items; an index built on a key function can't answer it
+        if self._index is not None and self._index_key is None:
+            try:
+                return bool(self._indexed_refs(item))
+            except TypeError:
+                pass
+        return any(element is item or element == item for element in self)
+
+    def extend(self, iterable):
+        for item in iterable:
+            self.insert_end(item)
+
+    def insert_many_at(self, index, iterable):
+        for offset, item in enumerate(iterable):
+            self.insert_at(index + offset, item)
+
+    def remove_range(self, start, stop):
+        self._check_range(start, stop)
+        for _ in range(stop - start):
+            self.remove_at(start)
+
+    def clear(self):
+        while not self.is_empty():
+            self.remove_end()
+
+    def _check_range(self, start, stop):
+        if start < 0 or stop > self.length() or start > stop:
+            raise IndexError('Range out of bound')
+
+    def _check_not_modified(self, modcount):
+        if self._modcount != modcount:
+            raise RuntimeError('Structure mutated during iteration')
+
+    def enable_index(self, key=None):
+        self._index_key = key
+        self._rebuild_index()
+
+    def disable_index(self):
+        self._index = None
+        self._index_key = None
+        self._index_dirty = False
+
+    def is_indexed(self):
+        return self._index is not None
+
+    def _key_of(self, item):
+        return item if self._index_key is None else self._index_key(item)
+
+    def _matches(self, item, key):
+        return self._key_of(item) == key
+
+    def _index_entries(self):
+        raise NotImplementedError('Key index not supported by this structure')
+
+    def _rebuild_index(self):
+        self._index = {}
+        self._index_dirty = False
+        for item, ref in self._index_entries():
+            self._index_add(item, ref)
+
+    def _index_add(self, item, ref):
+        self._index.setdefault(self._key_of(item), []).append(ref)
+
+    def _index_discard(self, item, ref):
+        key = self._key_of(item)
+        refs = self._index[key]
+        refs.remove(ref)
+        if not refs:
+            del self._index[key]
+
+    def _indexed_refs(self, key):
+        if self._index_dirty:
+            self._rebuild_index()
+        return self._index.get(key)
+
+    def _first_indexed_node(self, key):
+        refs = self._indexed_refs(key)
+        if not refs:
+            return None
+        if len(refs) == 1:
+            return refs[0]
+        candidates = set(map(id, refs))
+        current = self.head
+        while id(current) not in candidates:
+            current = current.next
+        return current
+
     @abstractmethod
     def insert_start(self, item):
         pass
@@ -82,14 +186,69 @@ class LinearDataStructure(ABC):
         pass
 
 
+def _merge_runs(left, right, key, reverse):
+    # em empate o nó da esquerda vem primeiro, o que mantém a ordenação estável
+    def before(a, b):
+        ka = a.data if key is None else key(a.data)
+        kb = b.data if key is None else key(b.data)
+        return not (ka < kb) if reverse else not (kb < ka)
+
+    if before(left, right):
+        head = left
+        left = left.next
+    else:
+        head = right
+        right = right.next
+    last = head
+    while left and right:
+        if before(left, right):
+            last.next = left
+            left = left.next
+        else:
+            last.next = right
+            right = right.next
+        last = last.next
+    last.next = left if left else right
+    return head
+
+
+def merge_sort_nodes(head, key=None, reverse=False):
+    runs = []
+    node = head
+    while node:
+        following = node.next
+        node.next = None
+        run = node
+        level = 0
+        while level < len(runs) and runs[level] is not None:
+            run = _merge_runs(runs[level], run, key, reverse)
+            runs[level] = None
+            level += 1
+        if level == len(runs):
+            runs.append(run)
+        else:
+            runs[level] = run
+        node = following
+    result = None
+    for run in runs:
+        if run is not None:
+            result = run if result is None else _merge_runs(run, result, key, reverse)
+    tail = result
+    while tail and tail.next:
+        tail = tail.next
+    return result, tail
+
+
 class IndexedArray(LinearDataStructure):
+    _empty = None
+
     def __init__(self, iterable=None, capacity=4):
         self.capacity = capacity
-        self.data = [None] * self.capacity
+        self.data = self._allocate(self.capacity)
+        self.start = 0
         self.size = 0
         if iterable is not None:
-            for item in iterable:
-                self.insert_end(item)
+            self.extend(iterable)
 
     def length(self):
         return self.size
@@ -100,31 +259,169 @@ class IndexedArray(LinearDataStructure):
     def is_full(self):
         return self.size == self.capacity
 
-    def _resize(self, new_capacity):
-        new_data = [None] * new_capacity
+    def __iter__(self):
+        modcount = self._modcount
         for i in range(self.size):
-            new_data[i] = self.data[i]
+            self._check_not_modified(modcount)
+            yield self.data[self.start + i]
+        self._check_not_modified(modcount)
+
+    def __reversed__(self):
+        modcount = self._modcount
+        for i in range(self.size - 1, -1, -1):
+            self._check_not_modified(modcount)
+            yield self.data[self.start + i]
+        self._check_not_modified(modcount)
+
+    def _allocate(self, capacity):
+        return [None] * capacity
+
+    def _materialize(self, iterable):
+        return list(iterable)
+
+    def _index_entries(self):
+        for pos in range(self.start, self.start + self.size):
+            yield self.data[pos], pos
+
+    def _index_live(self):
+        return self._index is not None and not self._index_dirty
+
+    def _resize(self, new_capacity, new_start=0):
+        if self._index is not None and new_start != self.start:
+            self._index_dirty = True
+        new_data = self._allocate(new_capacity)
+        new_data[new_start:new_start + self.size] = self.data[self.start:self.start + self.size]
         self.data = new_data
         self.capacity = new_capacity
+        self.start = new_start
+
+    def _make_room_end(self):
+        if self.start + self.size < self.capacity:
+            return
+        # FIFO-style use leaves slack at the front; reuse it before doubling
+        if self.start > self.capacity // 4:
+            self._resize(self.capacity, (self.capacity - self.size) // 2)
+        else:
+            self._resize(max(1, self.capacity * 2), self.start)
+
+    def _make_room_start(self):
+        if self.start > 0:
+            return
+        if self.capacity - self.size > self.capacity // 4:
+            self._resize(self.capacity, (self.capacity - self.size + 1) // 2)
+        else:
+            new_capacity = max(1, self.capacity * 2)
+            self._resize(new_capacity, new_capacity - self.capacity)
 
     def insert_start(self, item):
-        self.insert_at(0, item)
+        self._make_room_start()
+        self.start -= 1
+        self.data[self.start] = item
+        self.size += 1
+        self._modcount += 1
+        if self._index_live():
+            self._index_add(item, self.start)
 
     def insert_end(self, item):
-        if self.is_full():
-            self._resize(self.capacity * 2)
-        self.data[self.size] = item
+        end = self.start + self.size
+        if end == self.capacity:
+            self._make_room_end()
+            end = self.start + self.size
+        self.data[end] = item
+        if self._index is not None and not self._index_dirty:
+            self._index_add(item, end)
         self.size += 1
+        self._modcount += 1
 
     def insert_at(self, index, item):
         if index < 0 or index > self.size:
             raise IndexError('Index out of bound')
-        if self.is_full():
-            self._resize(self.capacity * 2)
-        for i in range(self.size, index, -1):
-            self.data[i] = self.data[i - 1]
-        self.data[index] = item
+        if index == 0:
+            self.insert_start(item)
+            return
+        if index == self.size:
+            self.insert_end(item)
+            return
+        if self._index is not None:
+            self._index_dirty = True
+        if index < self.size - index:
+            self._make_room_start()
+            s = self.start
+            self.data[s - 1:s - 1 + index] = self.data[s:s + index]
+            self.start -= 1
+        else:
+            self._make_room_end()
+            s = self.start
+            self.data[s + index + 1:s + self.size + 1] = self.data[s + index:s + self.size]
+        self.data[self.start + index] = item
         self.size += 1
+        self._modcount += 1
+
+    def _reserve_end(self, count):
+        if self.start + self.size + count <= self.capacity:
+            return
+        if self.size + count <= self.capacity:
+            self._resize(self.capacity, 0)
+        else:
+            self._resize(max(self.capacity * 2, self.size + count), 0)
+
+    def extend(self, iterable):
+        items = self._materialize(iterable)
+        count = len(items)
+        if count == 0:
+            return
+        self._reserve_end(count)
+        end = self.start + self.size
+        self.data[end:end + count] = items
+        if self._index_live():
+            for pos in range(end, end + count):
+                self._index_add(self.data[pos], pos)
+        self.size += count
+        self._modcount += 1
+
+    def insert_many_at(self, index, iterable):
+        if index < 0 or index > self.size:
+            raise IndexError('Index out of bound')
+        if index == self.size:
+            self.extend(iterable)
+            return
+        items = self._materialize(iterable)
+        count = len(items)
+        if count == 0:
+            return
+        self._reserve_end(count)
+        s = self.start
+        self.data[s + index + count:s + self.size + count] = self.data[s + index:s + self.size]
+        self.data[s + index:s + index + count] = items
+        if self._index is not None:
+            self._index_dirty = True
+        self.size += count
+        self._modcount += 1
+
+    def remove_range(self, start, stop):
+        self._check_range(start, stop)
+        count = stop - start
+        if count == 0:
+            return
+        s = self.start
+        if self._index is not None:
+            self._index_dirty = True
+        if start == 0:
+            self.data[s:s + count] = self._allocate(count)
+            self.start += count
+        else:
+            self.data[s + start:s + self.size - count] = self.data[s + stop:s + self.size]
+            self.data[s + self.size - count:s + self.size] = self._allocate(count)
+        self.size -= count
+        self._modcount += 1
+
+    def clear(self):
+        self.data = self._allocate(self.capacity)
+        self.start = 0
+        self.size = 0
+        self._modcount += 1
+        if self._index is not None:
+            self._rebuild_index()
 
     def insert_before_key(self, key, item):
         try:
@@ -140,76 +437,126 @@ class IndexedArray(LinearDataStructure):
         except ValueError:
             self.insert_end(item)
 
+    def _set_at(self, pos, item):
+        if self._index_live():
+            self._index_discard(self.data[pos], pos)
+            self._index_add(item, pos)
+        self.data[pos] = item
+
     def update_key(self, key, new_item):
         idx = self.find_index_of_key(key)
-        self.data[idx] = new_item
+        self._set_at(self.start + idx, new_item)
 
     def update_at(self, index, new_item):
         if index < 0 or index >= self.size:
             raise IndexError('Index out of bound')
-        self.data[index] = new_item
+        self._set_at(self.start + index, new_item)
 
     def remove_start(self):
         if self.is_empty():
             raise IndexError('Array underflow')
-        return self.remove_at(0)
+        item = self.data[self.start]
+        if self._index_live():
+            self._index_discard(item, self.start)
+        self.data[self.start] = self._empty
+        self.start += 1
+        self.size -= 1
+        self._modcount += 1
+        return item
 
     def remove_end(self):
-        if self.is_empty():
+        if self.size == 0:
             raise IndexError('Array underflow')
-        item = self.data[self.size - 1]
-        self.data[self.size - 1] = None
+        last = self.start + self.size - 1
+        item = self.data[last]
+        if self._index is not None and not self._index_dirty:
+            self._index_discard(item, last)
+        self.data[last] = self._empty
         self.size -= 1
+        self._modcount += 1
         return item
 
     def remove_at(self, index):
         if index < 0 or index >= self.size:
             raise IndexError('Index out of bound')
-        item = self.data[index]
-        for i in range(index, self.size - 1):
-            self.data[i] = self.data[i + 1]
-        self.data[self.size - 1] = None
+        if index == 0:
+            return self.remove_start()
+        if index == self.size - 1:
+            return self.remove_end()
+        if self._index is not None:
+            self._index_dirty = True
+        s = self.start
+        item = self.data[s + index]
+        if index < self.size - 1 - index:
+            self.data[s + 1:s + index + 1] = self.data[s:s + index]
+            self.data[s] = self._empty
+            self.start += 1
+        else:
+            self.data[s + index:s + self.size - 1] = self.data[s + index + 1:s + self.size]
+            self.data[s + self.size - 1] = self._empty
         self.size -= 1
+        self._modcount += 1
         return item
 
     def remove_key(self, key):
         try:
             idx = self.find_index_of_key(key)
-            self.remove_at(idx)
         except ValueError:
-            pass
+            return None
+        return self.remove_at(idx)
 
     def find_start(self):
         if self.is_empty():
             raise IndexError('Array underflow')
-        return self.data[0]
+        return self.data[self.start]
 
     def find_end(self):
         if self.is_empty():
             raise IndexError('Array underflow')
-        return self.data[self.size - 1]
+        return self.data[self.start + self.size - 1]
 
     def find_at(self, index):
         if index < 0 or index >= self.size:
             raise IndexError('Index out of bound')
-        return self.data[index]
+        return self.data[self.start + index]
 
     def find_key(self, key):
         idx = self.find_index_of_key(key)
-        return self.data[idx]
+        return self.data[self.start + idx]
 
     def find_next_key(self, key):
+        if self._index is not None:
+            refs = self._indexed_refs(key)
+            if not refs or len(refs) < 2:
+                raise ValueError('No next item with the key')
+            return self.data[sorted(refs)[1]]
         idx = self.find_index_of_key(key)
-        for i in range(idx + 1, self.size):
-            if self.data[i] == key:
-                return self.data[i]
-        raise ValueError('No next item with the key')
+        try:
+            pos = self._position_of(key, self.start + idx + 1, self.start + self.size)
+        except ValueError:
+            raise ValueError('No next item with the key') from None
+        return self.data[pos]
+
+    def _position_of(self, key, lo, hi):
+        # lists and arrays search in C; external buffers (memoryview) have no index()
+        index = getattr(self.data, 'index', None)
+        if index is not None:
+            return index(key, lo, hi)
+        for pos in range(lo, hi):
+            if self.data[pos] == key:
+                return pos
+        raise ValueError('Key not found')
 
     def find_index_of_key(self, key):
-        for i in range(self.size):
-            if self.data[i] == key:
-                return i
-        raise ValueError('Key not found')
+        if self._index is not None:
+            refs = self._indexed_refs(key)
+            if not refs:
+                raise ValueError('Key not found')
+            return min(refs) - self.start
+        try:
+            return self._position_of(key, self.start, self.start + self.size) - self.start
+        except ValueError:
+            raise ValueError('Key not found') from None
 
     def __getitem__(self, index):
         if not isinstance(index, int):
@@ -218,7 +565,7 @@ class IndexedArray(LinearDataStructure):
             index += self.size
         if index < 0 or index >= self.size:
             raise IndexError('Index out of bound')
-        return self.data[index]
+        return self.data[self.start + index]
 
     def __setitem__(self, index, value):
         if not isinstance(index, int):
@@ -230,157 +577,700 @@ class IndexedArray(LinearDataStructure):
             return
         if index < 0 or index > self.size:
             raise IndexError('Index out of bound')
-        self.data[index] = value
+        self._set_at(self.start + index, value)
+
+
+class TypedIndexedArray(IndexedArray):
+    _fixed = False
+
+    def __init__(self, typecode, iterable=None, capacity=4):
+        self.typecode = typecode
+        self.itemsize = array(typecode).itemsize
+        self._empty = array(typecode, bytes(self.itemsize))[0]
+        super().__init__(iterable, capacity)
+
+    @classmethod
+    def from_buffer(cls, typecode, buffer):
+        # wraps an external buffer (mmap, shared memory, bytearray) without copying;
+        # the length is fixed because the buffer cannot be reallocated
+        result = cls.__new__(cls)
+        result.typecode = typecode
+        result.itemsize = array(typecode).itemsize
+        result._empty = array(typecode, bytes(result.itemsize))[0]
+        result.data = memoryview(buffer).cast('B').cast(typecode)
+        result.capacity = result.size = len(result.data)
+        result.start = 0
+        result._fixed = True
+        return result
+
+    @classmethod
+    def from_array(cls, items):
+        # takes ownership of items instead of copying them
+        result = cls.__new__(cls)
+        result.typecode = items.typecode
+        result.itemsize = items.itemsize
+        result._empty = array(items.typecode, bytes(items.itemsize))[0]
+        result.data = items
+        result.capacity = result.size = len(items)
+        result.start = 0
+        return result
+
+    def _allocate(self, capacity):
+        return array(self.typecode, bytes(capacity * self.itemsize))
+
+    def _resize(self, new_capacity, new_start=0):
+        if self._fixed:
+            raise OverflowError('Buffer-backed array cannot be resized')
+        super()._resize(new_capacity, new_start)
+
+    def clear(self):
+        if not self._fixed:
+            super().clear()
+            return
+        # the external buffer stays attached; only its contents are reset
+        self.data[:] = self._allocate(self.capacity)
+        self.start = 0
+        self.size = 0
+        self._modcount += 1
+        if self._index is not None:
+            self._rebuild_index()
+
+    def release(self):
+        if self._fixed:
+            self.data.release()
+
+    def _materialize(self, iterable):
+        if isinstance(iterable, array) and iterable.typecode == self.typecode:
+            return iterable
+        return array(self.typecode, iterable)
+
+    def as_memoryview(self):
+        # a view stays attached to the current buffer until the next resize
+        return memoryview(self.data)[self.start:self.start + self.size]
+
+    def __buffer__(self, flags):
+        return self.as_memoryview()
+
+    def tobytes(self):
+        return self.data[self.start:self.start + self.size].tobytes()
+
+
+class Queue(LinearDataStructure):
+    def __init__(self, iterable=None, capacity=4, max_size=None):
+        if max_size is not None:
+            if max_size <= 0:
+                raise ValueError('max_size must be positive')
+            capacity = max_size
+        self.max_size = max_size
+        self.capacity = capacity
+        self.data = [None] * self.capacity
+        self.front = 0
+        self.size = 0
+        if iterable is not None:
+            self.extend(iterable)
+
+    def length(self):
+        return self.size
+
+    def is_empty(self):
+        return self.size == 0
+
+    def is_full(self):
+        return self.max_size is not None and self.size == self.max_size
+
+    def _physical(self, index):
+        return (self.front + index) % self.capacity
+
+    def __iter__(self):
+        modcount = self._modcount
+        for i in range(self.size):
+            self._check_not_modified(modcount)
+            yield self.data[(self.front + i) % self.capacity]
+        self._check_not_modified(modcount)
+
+    def __reversed__(self):
+        modcount = self._modcount
+        for i in range(self.size - 1, -1, -1):
+            self._check_not_modified(modcount)
+            yield self.data[(self.front + i) % self.capacity]
+        self._check_not_modified(modcount)
+
+    def _index_entries(self):
+        for i in range(self.size):
+            pos = self._physical(i)
+            yield self.data[pos], pos
+
+    def _index_live(self):
+        return self._index is not None and not self._index_dirty
+
+    def _resize(self, new_capacity):
+        if self._index is not None:
+            self._index_dirty = True
+        new_data = [None] * new_capacity
+        end = self.front + self.size
+        if end <= self.capacity:
+            new_data[:self.size] = self.data[self.front:end]
+        else:
+            first = self.capacity - self.front
+            new_data[:first] = self.data[self.front:]
+            new_data[first:self.size] = self.data[:end - self.capacity]
+        self.data = new_data
+        self.capacity = new_capacity
+        self.front = 0
+
+    def _ensure_room(self):
+        if self.is_full():
+            raise OverflowError('Queue overflow')
+        if self.size == self.capacity:
+            self._resize(max(1, self.capacity * 2))
+
+    def _reserve(self, count):
+        if self.max_size is not None and self.size + count > self.max_size:
+            raise OverflowError('Queue overflow')
+        if self.size + count > self.capacity:
+            self._resize(max(1, self.capacity * 2, self.size + count))
+
+    def extend(self, iterable):
+        items = list(iterable)
+        count = len(items)
+        if count == 0:
+            return
+        self._reserve(count)
+        end = (self.front + self.size) % self.capacity
+        first = min(count, self.capacity - end)
+        self.data[end:end + first] = items[:first]
+        self.data[:count - first] = items[first:]
+        if self._index_live():
+            for i, item in enumerate(items):
+                self._index_add(item, (end + i) % self.capacity)
+        self.size += count
+        self._modcount += 1
+
+    def insert_many_at(self, index, iterable):
+        if index < 0 or index > self.size:
+            raise IndexError('Index out of bound')
+        if index == self.size:
+            self.extend(iterable)
+            return
+        items = list(iterable)
+        count = len(items)
+        if count == 0:
+            return
+        self._reserve(count)
+        if self.front + self.size + count > self.capacity:
+            self._resize(self.capacity)
+        f = self.front
+        self.data[f + index + count:f + self.size + count] = self.data[f + index:f + self.size]
+        self.data[f + index:f + index + count] = items
+        if self._index is not None:
+            self._index_dirty = True
+        self.size += count
+        self._modcount += 1
+
+    def remove_range(self, start, stop):
+        self._check_range(start, stop)
+        count = stop - start
+        if count == 0:
+            return
+        if self.front + self.size > self.capacity:
+            self._resize(self.capacity)
+        f = self.front
+        self.data[f + start:f + self.size - count] = self.data[f + stop:f + self.size]
+        self.data[f + self.size - count:f + self.size] = [None] * count
+        if self._index is not None:
+            self._index_dirty = True
+        self.size -= count
+        self._modcount += 1
+
+    def clear(self):
+        self.data = [None] * self.capacity
+        self.front = 0
+        self.size = 0
+        self._modcount += 1
+        if self._index is not None:
+            self._rebuild_index()
+
+    def insert_start(self, item):
+        self._ensure_room()
+        self.front = (self.front - 1) % self.capacity
+        self.data[self.front] = item
+        self.size += 1
+        self._modcount += 1
+        if self._index_live():
+            self._index_add(item, self.front)
+
+    def insert_end(self, item):
+        self._ensure_room()
+        pos = (self.front + self.size) % self.capacity
+        self.data[pos] = item
+        self.size += 1
+        self._modcount += 1
+        if self._index_live():
+            self._index_add(item, pos)
+
+    def insert_at(self, index, item):
+        if index < 0 or index > self.size:
+            raise IndexError('Index out of bound')
+        if index == 0:
+            self.insert_start(item)
+            return
+        if index == self.size:
+            self.insert_end(item)
+            return
+        self._ensure_room()
+        if self._index is not None:
+            self._index_dirty = True
+        if index < self.size // 2:
+            self.front = (self.front - 1) % self.capacity
+            for i in range(index):
+                self.data[self._physical(i)] = self.data[self._physical(i + 1)]
+        else:
+            for i in range(self.size, index, -1):
+                self.data[self._physical(i)] = self.data[self._physical(i - 1)]
+        self.data[self._physical(index)] = item
+        self.size += 1
+        self._modcount += 1
+
+    def insert_before_key(self, key, item):
+        try:
+            idx = self.find_index_of_key(key)
+            self.insert_at(idx, item)
+        except ValueError:
+            self.insert_end(item)
+
+    def insert_after_key(self, key, item):
+        try:
+            idx = self.find_index_of_key(key)
+            self.insert_at(idx + 1, item)
+        except ValueError:
+            self.insert_end(item)
+
+    def _set_at(self, pos, item):
+        if self._index_live():
+            self._index_discard(self.data[pos], pos)
+            self._index_add(item, pos)
+        self.data[pos] = item
+
+    def update_key(self, key, new_item):
+        idx = self.find_index_of_key(key)
+        self._set_at(self._physical(idx), new_item)
+
+    def update_at(self, index, new_item):
+        if index < 0 or index >= self.size:
+            raise IndexError('Index out of bound')
+        self._set_at(self._physical(index), new_item)
+
+    def remove_start(self):
+        if self.is_empty():
+            raise IndexError('Queue underflow')
+        item = self.data[self.front]
+        if self._index_live():
+            self._index_discard(item, self.front)
+        self.data[self.front] = None
+        self.front = (self.front + 1) % self.capacity
+        self.size -= 1
+        self._modcount += 1
+        return item
+
+    def remove_end(self):
+        if self.is_empty():
+            raise IndexError('Queue underflow')
+        last = self._physical(self.size - 1)
+        item = self.data[last]
+        if self._index_live():
+            self._index_discard(item, last)
+        self.data[last] = None
+        self.size -= 1
+        self._modcount += 1
+        return item
+
+    def remove_at(self, index):
+        if index < 0 or index >= self.size:
+            raise IndexError('Index out of bound')
+        if index == 0:
+            return self.remove_start()
+        if index == self.size - 1:
+            return self.remove_end()
+        if self._index is not None:
+            self._index_dirty = True
+        item = self.data[self._physical(index)]
+        if index < self.size // 2:
+            for i in range(index, 0, -1):
+                self.data[self._physical(i)] = self.data[self._physical(i - 1)]
+            self.data[self.front] = None
+            self.front = (self.front + 1) % self.capacity
+        else:
+            for i in range(index, self.size - 1):
+                self.data[self._physical(i)] = self.data[self._physical(i + 1)]
+            self.data[self._physical(self.size - 1)] = None
+        self.size -= 1
+        self._modcount += 1
+        return item
+
+    def remove_key(self, key):
+        try:
+            idx = self.find_index_of_key(key)
+        except ValueError:
+            return None
+        return self.remove_at(idx)
+
+    def find_start(self):
+        if self.is_empty():
+            raise IndexError('Queue underflow')
+        return self.data[self.front]
+
+    def find_end(self):
+        if self.is_empty():
+            raise IndexError('Queue underflow')
+        return self.data[self._physical(self.size - 1)]
+
+    def find_at(self, index):
+        if index < 0 or index >= self.size:
+            raise IndexError('Index out of bound')
+        return self.data[self._physical(index)]
+
+    def find_key(self, key):
+        idx = self.find_index_of_key(key)
+        return self.data[self._physical(idx)]
+
+    def _logical_positions(self, key):
+        refs = self._indexed_refs(key)
+        if not refs:
+            return []
+        return sorted((pos - self.front) % self.capacity for pos in refs)
+
+    def find_next_key(self, key):
+        if self._index is not None:
+            positions = self._logical_positions(key)
+            if len(positions) < 2:
+                raise ValueError('No next item with the key')
+            return self.data[self._physical(positions[1])]
+        idx = self.find_index_of_key(key)
+        for i in range(idx + 1, self.size):
+            if self.data[self._physical(i)] == key:
+                return self.data[self._physical(i)]
+        raise ValueError('No next item with the key')
+
+    def find_index_of_key(self, key):
+        if self._index is not None:
+            positions = self._logical_positions(key)
+            if not positions:
+                raise ValueError('Key not found')
+            return positions[0]
+        for i in range(self.size):
+            if self.data[self._physical(i)] == key:
+                return i
+        raise ValueError('Key not found')
 
 
 class SinglyLinkedListNode:
+    __slots__ = ('data', 'next')
+
     def __init__(self, data):
         self.data = data
         self.next = None
 
 
 class SinglyLinkedList(LinearDataStructure):
+    # while indexed, node -> predecessor (None for the head), so keyed
+    # removal and insert-before don't walk from the head
+    _predecessors = None
+
     def __init__(self, iterable=None):
         super().__init__()
         self.head = None
+        self.tail = None
+        self.size = 0
         if iterable is not None:
-            for item in iterable:
-                self.insert_end(item)
+            self.extend(iterable)
 
     def length(self):
-        count = 0
+        return self.size
+
+    def is_empty(self):
+        return self.head is None
+
+    def __iter__(self):
+        modcount = self._modcount
+        current = self.head
+        while current:
+            yield current.data
+            self._check_not_modified(modcount)
+            current = current.next
+
+    def _index_entries(self):
+        current = self.head
+        while current:
+            yield current.data, current
+            current = current.next
+
+    def _rebuild_index(self):
+        super()._rebuild_index()
+        self._predecessors = {}
+        prev = None
         current = self.head
         while current:
+            self._predecessors[current] = prev
+            prev = current
+            current = current.next
+
+    def disable_index(self):
+        super().disable_index()
+        self._predecessors = None
+
+    def _find_node(self, key):
+        if self._index is not None:
+            return self._first_indexed_node(key)
+        current = self.head
+        while current and current.data != key:
+            current = current.next
+        return current
+
+    def _find_with_prev(self, key):
+        if self._index is not None:
+            node = self._first_indexed_node(key)
+            if node is None:
+                return None, None
+            return self._predecessors[node], node
+        prev = None
+        current = self.head
+        while current and current.data != key:
+            prev = current
+            current = current.next
+        return prev, current
+
+    def _set_node_data(self, node, item):
+        if self._index is not None:
+            self._index_discard(node.data, node)
+            self._index_add(item, node)
+        node.data = item
+
+    def _build_chain(self, iterable):
+        indexed = self._index is not None
+        first = None
+        last = None
+        count = 0
+        for item in iterable:
+            new_node = SinglyLinkedListNode(item)
+            if last is None:
+                first = new_node
+            else:
+                last.next = new_node
+            if indexed:
+                self._index_add(item, new_node)
+                self._predecessors[new_node] = last
+            last = new_node
             count += 1
+        return first, last, count
+
+    def extend(self, iterable):
+        self.insert_many_at(self.size, iterable)
+
+    def insert_many_at(self, index, iterable):
+        if index < 0 or index > self.size:
+            raise IndexError('Index out of bound')
+        first, last, count = self._build_chain(iterable)
+        if count == 0:
+            return
+        if index == 0:
+            previous = None
+            last.next = self.head
+            self.head = first
+        else:
+            previous = self.tail if index == self.size else self._node_before(index)
+            last.next = previous.next
+            previous.next = first
+        if last.next is None:
+            self.tail = last
+        elif self._index is not None:
+            self._predecessors[last.next] = last
+        if self._index is not None:
+            self._predecessors[first] = previous
+        self.size += count
+        self._modcount += 1
+
+    def _node_before(self, index):
+        current = self.head
+        for _ in range(index - 1):
             current = current.next
-        return count
+        return current
 
-    def is_empty(self):
-        return self.head is None
+    def remove_range(self, start, stop):
+        self._check_range(start, stop)
+        if start == stop:
+            return
+        previous = self._node_before(start) if start > 0 else None
+        current = previous.next if previous else self.head
+        for _ in range(stop - start):
+            if self._index is not None:
+                self._index_discard(current.data, current)
+                del self._predecessors[current]
+            current = current.next
+        if previous:
+            previous.next = current
+        else:
+            self.head = current
+        if current is None:
+            self.tail = previous
+        elif self._index is not None:
+            self._predecessors[current] = previous
+        self.size -= stop - start
+        self._modcount += 1
+
+    def clear(self):
+        self.head = None
+        self.tail = None
+        self.size = 0
+        self._modcount += 1
+        if self._index is not None:
+            self._rebuild_index()
 
     def insert_start(self, item):
         new_node = SinglyLinkedListNode(item)
         new_node.next = self.head
         self.head = new_node
+        if self.tail is None:
+            self.tail = new_node
+        self.size += 1
+        self._modcount += 1
+        if self._index is not None:
+            self._index_add(item, new_node)
+            self._predecessors[new_node] = None
+            if new_node.next is not None:
+                self._predecessors[new_node.next] = new_node
 
     def insert_end(self, item):
         new_node = SinglyLinkedListNode(item)
-        if self.head is None:
+        previous = self.tail
+        if previous is None:
             self.head = new_node
-            return
-        last = self.head
-        while last.next:
-            last = last.next
-        last.next = new_node
+        else:
+            previous.next = new_node
+        self.tail = new_node
+        self.size += 1
+        self._modcount += 1
+        if self._index is not None:
+            self._index_add(item, new_node)
+            self._predecessors[new_node] = previous
 
     def insert_at(self, index, item):
-        if index < 0:
+        if index < 0 or index > self.size:
             raise IndexError('Index out of bound')
         if index == 0:
             self.insert_start(item)
             return
+        if index == self.size:
+            self.insert_end(item)
+            return
         current = self.head
-        count = 0
-        while current and count < index - 1:
+        for _ in range(index - 1):
             current = current.next
-            count += 1
-        if current is None:
-            raise IndexError('Index out of bound')
+        self._insert_after_node(current, item)
+
+    def _insert_after_node(self, node, item):
         new_node = SinglyLinkedListNode(item)
-        new_node.next = current.next
-        current.next = new_node
+        new_node.next = node.next
+        node.next = new_node
+        if node is self.tail:
+            self.tail = new_node
+        self.size += 1
+        self._modcount += 1
+        if self._index is not None:
+            self._index_add(item, new_node)
+            self._predecessors[new_node] = node
+            if new_node.next is not None:
+                self._predecessors[new_node.next] = new_node
+
+    def _remove_after_node(self, node):
+        removed = node.next
+        node.next = removed.next
+        if removed is self.tail:
+            self.tail = node
+        self.size -= 1
+        self._modcount += 1
+        if self._index is not None:
+            self._index_discard(removed.data, removed)
+            del self._predecessors[removed]
+            if node.next is not None:
+                self._predecessors[node.next] = node
+        return removed.data
 
     def insert_before_key(self, key, item):
-        if self.head is None:
+        prev, node = self._find_with_prev(key)
+        if node is None:
             self.insert_end(item)
-            return
-        if self.head.data == key:
+        elif prev is None:
             self.insert_start(item)
-            return
-        current = self.head
-        while current.next and current.next.data != key:
-            current = current.next
-        if current.next is None:
-            self.insert_end(item)
         else:
-            new_node = SinglyLinkedListNode(item)
-            new_node.next = current.next
-            current.next = new_node
+            self._insert_after_node(prev, item)
 
     def insert_after_key(self, key, item):
-        current = self.head
-        while current and current.data != key:
-            current = current.next
-        if current is None:
+        node = self._find_node(key)
+        if node is None:
             self.insert_end(item)
         else:
-            new_node = SinglyLinkedListNode(item)
-            new_node.next = current.next
-            current.next = new_node
+            self._insert_after_node(node, item)
 
     def update_key(self, key, new_item):
-        current = self.head
-        while current and current.data != key:
-            current = current.next
-        if current is None:
+        node = self._find_node(key)
+        if node is None:
             raise ValueError('Key not found')
-        current.data = new_item
+        self._set_node_data(node, new_item)
 
     def update_at(self, index, new_item):
-        if index < 0:
+        if index < 0 or index >= self.size:
             raise IndexError('Index out of bound')
+        if index == self.size - 1:
+            self._set_node_data(self.tail, new_item)
+            return
         current = self.head
-        count = 0
-        while current and count < index:
+        for _ in range(index):
             current = current.next
-            count += 1
-        if current is None:
-            raise IndexError('Index out of bound')
-        current.data = new_item
+        self._set_node_data(current, new_item)
 
     def remove_start(self):
         if self.head is None:
             raise IndexError('List underflow')
-        self.head = self.head.next
+        removed = self.head
+        self.head = removed.next
+        if self.head is None:
+            self.tail = None
+        self.size -= 1
+        self._modcount += 1
+        if self._index is not None:
+            self._index_discard(removed.data, removed)
+            del self._predecessors[removed]
+            if self.head is not None:
+                self._predecessors[self.head] = None
+        return removed.data
 
     def remove_end(self):
         if self.head is None:
             raise IndexError('List underflow')
         if self.head.next is None:
-            self.head = None
-            return
+            return self.remove_start()
         current = self.head
-        while current.next and current.next.next:
+        while current.next is not self.tail:
             current = current.next
-        current.next = None
+        return self._remove_after_node(current)
 
     def remove_at(self, index):
-        if index < 0:
+        if index < 0 or index >= self.size:
             raise IndexError('Index out of bound')
         if index == 0:
-            self.remove_start()
-            return
+            return self.remove_start()
         current = self.head
-        count = 0
-        while current.next and count < index - 1:
+        for _ in range(index - 1):
             current = current.next
-            count += 1
-        if current.next is None:
-            raise IndexError('Index out of bound')
-        current.next = current.next.next
+        return self._remove_after_node(current)
 
     def remove_key(self, key):
-        if self.head is None:
-            return
-        if self.head.data == key:
-            self.head = self.head.next
-            return
-        current = self.head
-        while current.next and current.next.data != key:
-            current = current.next
-        if current.next is None:
-            return
-        current.next = current.next.next
+        prev, node = self._find_with_prev(key)
+        if node is None:
+            return None
+        if prev is None:
+            return self.remove_start()
+        return self._remove_after_node(prev)
 
     def find_start(self):
         if self.head is None:
@@ -388,46 +1278,40 @@ class SinglyLinkedList(LinearDataStructure):
         return self.head.data
 
     def find_end(self):
-        if self.head is None:
+        if self.tail is None:
             raise IndexError('List underflow')
-        current = self.head
-        while current.next:
-            current = current.next
-        return current.data
+        return self.tail.data
 
     def find_at(self, index):
-        if index < 0:
+        if index < 0 or index >= self.size:
             raise IndexError('Index out of bound')
+        if index == self.size - 1:
+            return self.tail.data
         current = self.head
-        count = 0
-        while current and count < index:
+        for _ in range(index):
             current = current.next
-            count += 1
-        if current is None:
-            raise IndexError('Index out of bound')
         return current.data
 
     def find_key(self, key):
-        current = self.head
-        while current and current.data != key:
-            current = current.next
-        if current is None:
+        node = self._find_node(key)
+        if node is None:
             raise ValueError('Key not found')
-        return current.data
+        return node.data
 
     def find_next_key(self, key):
-        current = self.head
-        found = False
-        while current:
-            if found and current.data == key:
-                return current.data
-            if current.data == key:
-                found = True
-            current = current.next
+        node = self._find_node(key)
+        if node is not None:
+            current = node.next
+            while current:
+                if self._matches(current.data, key):
+                    return current.data
+                current = current.next
         raise ValueError('No next item with the key')
 
 
 class DoublyLinkedListNode:
+    __slots__ = ('data', 'next', 'prev')
+
     def __init__(self, data):
         self.data = data
         self.next = None
@@ -439,40 +1323,184 @@ class DoublyLinkedList(LinearDataStructure):
         super().__init__()
         self.head = None
         self.tail = None
+        self.size = 0
         if iterable is not None:
-            for item in iterable:
-                self.insert_end(item)
+            self.extend(iterable)
 
     def length(self):
-        count = 0
+        return self.size
+
+    def is_empty(self):
+        return self.head is None
+
+    def __iter__(self):
+        modcount = self._modcount
         current = self.head
         while current:
-            count += 1
+            yield current.data
+            self._check_not_modified(modcount)
             current = current.next
-        return count
 
-    def is_empty(self):
-        return self.head is None
+    def __reversed__(self):
+        modcount = self._modcount
+        current = self.tail
+        while current:
+            yield current.data
+            self._check_not_modified(modcount)
+            current = current.prev
 
-    def insert_start(self, item):
-        new_node = DoublyLinkedListNode(item)
-        if self.head is None:
-            self.head = new_node
-            self.tail = new_node
-        else:
-            new_node.next = self.head
-            self.head.prev = new_node
-            self.head = new_node
+    def _index_entries(self):
+        current = self.head
+        while current:
+            yield current.data, current
+            current = current.next
 
-    def insert_end(self, item):
-        new_node = DoublyLinkedListNode(item)
-        if self.tail is None:
-            self.head = new_node
-            self.tail = new_node
+    def _find_node(self, key):
+        if self._index is not None:
+            return self._first_indexed_node(key)
+        current = self.head
+        while current and current.data != key:
+            current = current.next
+        return current
+
+    def _set_node_data(self, node, item):
+        if self._index is not None:
+            self._index_discard(node.data, node)
+            self._index_add(item, node)
+        node.data = item
+
+    def _node_at(self, index):
+        if index < self.size // 2:
+            current = self.head
+            for _ in range(index):
+                current = current.next
         else:
-            self.tail.next = new_node
+            current = self.tail
+            for _ in range(self.size - 1 - index):
+                current = current.prev
+        return current
+
+    def _insert_before_node(self, node, item):
+        self._link_before(node, DoublyLinkedListNode(item))
+
+    def _insert_after_node(self, node, item):
+        self._link_before(node.next, DoublyLinkedListNode(item))
+
+    def _link_before(self, node, new_node):
+        if node is None:
             new_node.prev = self.tail
+            new_node.next = None
+            if self.tail:
+                self.tail.next = new_node
+            else:
+                self.head = new_node
             self.tail = new_node
+        else:
+            new_node.next = node
+            new_node.prev = node.prev
+            if node.prev:
+                node.prev.next = new_node
+            else:
+                self.head = new_node
+            node.prev = new_node
+        self.size += 1
+        self._modcount += 1
+        if self._index is not None:
+            self._index_add(new_node.data, new_node)
+
+    def _unlink(self, node):
+        if node.prev:
+            node.prev.next = node.next
+        else:
+            self.head = node.next
+        if node.next:
+            node.next.prev = node.prev
+        else:
+            self.tail = node.prev
+        node.prev = None
+        node.next = None
+        self.size -= 1
+        self._modcount += 1
+        if self._index is not None:
+            self._index_discard(node.data, node)
+        return node.data
+
+    def _build_chain(self, iterable):
+        indexed = self._index is not None
+        first = None
+        last = None
+        count = 0
+        for item in iterable:
+            new_node = DoublyLinkedListNode(item)
+            if last is None:
+                first = new_node
+            else:
+                last.next = new_node
+                new_node.prev = last
+            last = new_node
+            count += 1
+            if indexed:
+                self._index_add(item, new_node)
+        return first, last, count
+
+    def extend(self, iterable):
+        self.insert_many_at(self.size, iterable)
+
+    def insert_many_at(self, index, iterable):
+        if index < 0 or index > self.size:
+            raise IndexError('Index out of bound')
+        first, last, count = self._build_chain(iterable)
+        if count == 0:
+            return
+        following = self._node_at(index) if index < self.size else None
+        previous = following.prev if following else self.tail
+        first.prev = previous
+        last.next = following
+        if previous:
+            previous.next = first
+        else:
+            self.head = first
+        if following:
+            following.prev = last
+        else:
+            self.tail = last
+        self.size += count
+        self._modcount += 1
+
+    def remove_range(self, start, stop):
+        self._check_range(start, stop)
+        if start == stop:
+            return
+        previous = self._node_at(start).prev
+        current = previous.next if previous else self.head
+        for _ in range(stop - start):
+            if self._index is not None:
+                self._index_discard(current.data, current)
+            current = current.next
+        if previous:
+            previous.next = current
+        else:
+            self.head = current
+        if current:
+            current.prev = previous
+        else:
+            self.tail = previous
+        self.size -= stop - start
+        self._modcount += 1
+
+    def clear(self):
+        self.head = None
+        self.tail = None
+        self.size = 0
+        self._modcount += 1
+        if self._index is not None:
+            self._rebuild_index()
+
+    def insert_start(self, item):
+        self._link_before(self.head, DoublyLinkedListNode(item))
+
+    def insert_end(self, item):
+        self._link_before(None, DoublyLinkedListNode(item))
 
     def insert_at(self, index, item):
         if index < 0:
@@ -480,129 +1508,56 @@ class DoublyLinkedList(LinearDataStructure):
         if index == 0:
             self.insert_start(item)
             return
-        current = self.head
-        count = 0
-        while current and count < index:
-            current = current.next
-            count += 1
-        if current is None:
+        if index >= self.size:
             self.insert_end(item)
             return
-        new_node = DoublyLinkedListNode(item)
-        new_node.next = current
-        new_node.prev = current.prev
-        if current.prev:
-            current.prev.next = new_node
-        current.prev = new_node
-        if index == 0:
-            self.head = new_node
+        self._insert_before_node(self._node_at(index), item)
 
     def insert_before_key(self, key, item):
-        current = self.head
-        while current and current.data != key:
-            current = current.next
-        if current is None:
+        node = self._find_node(key)
+        if node is None:
             self.insert_end(item)
         else:
-            new_node = DoublyLinkedListNode(item)
-            new_node.next = current
-            new_node.prev = current.prev
-            if current.prev:
-                current.prev.next = new_node
-            else:
-                self.head = new_node
-            current.prev = new_node
+            self._insert_before_node(node, item)
 
     def insert_after_key(self, key, item):
-        current = self.head
-        while current and current.data != key:
-            current = current.next
-        if current is None:
+        node = self._find_node(key)
+        if node is None:
             self.insert_end(item)
         else:
-            new_node = DoublyLinkedListNode(item)
-            new_node.prev = current
-            new_node.next = current.next
-            if current.next:
-                current.next.prev = new_node
-            else:
-                self.tail = new_node
-            current.next = new_node
+            self._insert_after_node(node, item)
 
     def update_key(self, key, new_item):
-        current = self.head
-        while current and current.data != key:
-            current = current.next
-        if current is None:
+        node = self._find_node(key)
+        if node is None:
             raise ValueError('Key not found')
-        current.data = new_item
+        self._set_node_data(node, new_item)
 
     def update_at(self, index, new_item):
-        if index < 0:
-            raise IndexError('Index out of bound')
-        current = self.head
-        count = 0
-        while current and count < index:
-            current = current.next
-            count += 1
-        if current is None:
+        if index < 0 or index >= self.size:
             raise IndexError('Index out of bound')
-        current.data = new_item
+        self._set_node_data(self._node_at(index), new_item)
 
     def remove_start(self):
         if self.head is None:
             raise IndexError('List underflow')
-        if self.head.next is None:
-            self.head = None
-            self.tail = None
-            return
-        self.head = self.head.next
-        self.head.prev = None
+        return self._unlink(self.head)
 
     def remove_end(self):
         if self.tail is None:
             raise IndexError('List underflow')
-        if self.tail.prev is None:
-            self.head = None
-            self.tail = None
-            return
-        self.tail = self.tail.prev
-        self.tail.next = None
+        return self._unlink(self.tail)
 
     def remove_at(self, index):
-        if index < 0:
-            raise IndexError('Index out of bound')
-        if index == 0:
-            self.remove_start()
-            return
-        current = self.head
-        count = 0
-        while current and count < index:
-            current = current.next
-            count += 1
-        if current is None:
+        if index < 0 or index >= self.size:
             raise IndexError('Index out of bound')
-        if current.prev:
-            current.prev.next = current.next
-        if current.next:
-            current.next.prev = current.prev
-        if current == self.tail:
-            self.tail = current.prev
+        return self._unlink(self._node_at(index))
 
     def remove_key(self, key):
-        current = self.head
-        while current and current.data != key:
-            current = current.next
-        if current is None:
-            return
-        if current.prev:
-            current.prev.next = current.next
-        else:
-            self.head = current.next
-        if current.next:
-            current.next.prev = current.prev
-        else:
-            self.tail = current.prev
+        node = self._find_node(key)
+        if node is None:
+            return None
+        return self._unlink(node)
 
     def find_start(self):
         if self.head is None:
@@ -615,32 +1570,22 @@ class DoublyLinkedList(LinearDataStructure):
         return self.tail.data
 
     def find_at(self, index):
-        if index < 0:
-            raise IndexError('Index out of bound')
-        current = self.head
-        count = 0
-        while current and count < index:
-            current = current.next
-            count += 1
-        if current is None:
+        if index < 0 or index >= self.size:
             raise IndexError('Index out of bound')
-        return current.data
+        return self._node_at(index).data
 
     def find_key(self, key):
-        current = self.head
-        while current and current.data != key:
-            current = current.next
-        if current is None:
+        node = self._find_node(key)
+        if node is None:
             raise ValueError('Key not found')
-        return current.data
+        return node.data
 
     def find_next_key(self, key):
-        current = self.head
-        found = False
-        while current:
-            if found and current.data == key:
-                return current.data
-            if current.data == key:
-                found = True
-            current = current.next
+        node = self._find_node(key)
+        if node is not None:
+            current = node.next
+            while current:
+                if self._matches(current.data, key):
+                    return current.data
+                current = current.next
         raise ValueError('No next item with the key')
@@ -1,6 +1,9 @@
 import math
+from linear_structures import merge_sort_nodes
 
 class CircularNode:
+    __slots__ = ('data', 'next')
+
     def __init__(self, data):
         self.data = data
         self.next = None
@@ -11,6 +14,7 @@ class SimpleCircularList:
         self.count = 0
         self.head = None
         self.current = None
+        self._modcount = 0
         if iterable is not None:
             for item in iterable:
                 self.insert(item)
@@ -28,6 +32,7 @@ class SimpleCircularList:
             self.current.next = new_node
             self.current = new_node
         self.count += 1
+        self._modcount += 1
 
     def remove(self):
         if self.count == 0:
@@ -41,6 +46,7 @@ class SimpleCircularList:
             if remove_node == self.head:
                 self.head = remove_node.next
         self.count -= 1
+        self._modcount += 1
         return remove_node.data
 
     def peek(self, index):
@@ -63,19 +69,27 @@ class SimpleCircularList:
         node.data, next_node.data = next_node.data, node.data
 
     def bubble_sort(self):
+        self.merge_sort()
+
+    def merge_sort(self, key=None, reverse=False):
         if self.count < 2:
             return
+        self.current.next = None
+        self.head, self.current = merge_sort_nodes(self.head, key, reverse)
+        self.current.next = self.head
+        self._modcount += 1
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        modcount = self._modcount
+        node = self.head
         for _ in range(self.count):
-            swapped = False
-            node = self.head
-            for _ in range(self.count - 1):
-                nxt = node.next
-                if node.data > nxt.data:
-                    node.data, nxt.data = nxt.data, node.data
-                    swapped = True
-                node = node.next
-            if not swapped:
-                break
+            yield node.data
+            if self._modcount != modcount:
+                raise RuntimeError("Lista circular alterada durante a iteração")
+            node = node.next
 
     def calcular_perimetro(self):
         if self.count < 2:
@@ -96,14 +110,7 @@ class SimpleCircularList:
         return math.sqrt(dx * dx + dy * dy)
 
     def __str__(self):
-        if self.count == 0:
-            return "[]"
-        result = []
-        node = self.head
-        for _ in range(self.count):
-            result.append(str(node.data))
-            node = node.next
-        return "[" + ", ".join(result) + "]"
+        return "[" + ", ".join(str(item) for item in self) + "]"
 
 
 class Ponto:
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from fila_prioridade import FilaDePrioridade
+
+MODOS = ['lista', 'heap']
+
+
+def conferir(fila, modelo):
+    assert fila.tamanho() == len(modelo)
+    assert fila.esta_vazia() == (not modelo)
+
+
+def maior(modelo):
+    return max(modelo, key=lambda referencia: modelo[referencia])
+
+
+@pytest.mark.parametrize('modo', MODOS)
+@pytest.mark.parametrize('semente', range(20))
+def test_referencias_seguem_o_modelo(modo, semente):
+    rng = random.Random(semente)
+    fila = FilaDePrioridade(modo=modo)
+    outra = FilaDePrioridade(modo=modo)
+    # referência -> prioridade; valores aleatórios não empatam
+    modelo = {}
+    estrangeiras = [outra.inserir(rng.random()) for _ in range(5)]
+    invalidas = []
+    for _ in range(300):
+        operacao = rng.choice(['inserir', 'inserir', 'atualizar', 'remover', 'remover_maior', 'invalida'])
+        if operacao == 'inserir':
+            prioridade = rng.random()
+            modelo[fila.inserir(prioridade)] = prioridade
+        elif operacao == 'atualizar' and modelo:
+            referencia = rng.choice(list(modelo))
+            modelo[referencia] = rng.random()
+            fila.atualizar_prioridade(referencia, modelo[referencia])
+        elif operacao == 'remover' and modelo:
+            referencia = rng.choice(list(modelo))
+            assert fila.remover(referencia) == modelo.pop(referencia)
+            invalidas.append(referencia)
+        elif operacao == 'remover_maior' and modelo:
+            referencia = maior(modelo)
+            assert fila.remover_maior_prioridade() == modelo.pop(referencia)
+            invalidas.append(referencia)
+        elif operacao == 'invalida' and invalidas:
+            referencia = rng.choice(invalidas + estrangeiras)
+            with pytest.raises(ValueError):
+                fila.atualizar_prioridade(referencia, rng.random())
+            with pytest.raises(ValueError):
+                fila.remover(referencia)
+        conferir(fila, modelo)
+        conferir(outra, estrangeiras)
+    while modelo:
+        referencia = maior(modelo)
+        assert fila.remover_maior_prioridade() == modelo.pop(referencia)
+    conferir(fila, modelo)
+
+
+@pytest.mark.parametrize('modo', MODOS)
+def test_referencia_de_outra_fila_nao_altera_nenhuma(modo):
+    fila = FilaDePrioridade([1, 2, 3], modo=modo)
+    outra = FilaDePrioridade(modo=modo)
+    referencia = outra.inserir(5)
+    with pytest.raises(ValueError):
+        fila.remover(referencia)
+    with pytest.raises(ValueError):
+        fila.atualizar_prioridade(referencia, 9)
+    assert fila.tamanho() == 3
+    assert outra.tamanho() == 1
+    assert outra.remover(referencia) == 5
+    with pytest.raises(ValueError):
+        outra.remover(referencia)
+    assert outra.esta_vazia()
+    assert fila.remover_maior_prioridade() == 3
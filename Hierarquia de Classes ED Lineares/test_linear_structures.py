@@ -0,0 +1,240 @@
+import random
+
+import pytest
+
+from linear_structures import DoublyLinkedList, IndexedArray, Queue, SinglyLinkedList, TypedIndexedArray
+
+LISTS = [SinglyLinkedList, DoublyLinkedList]
+# small capacities so growth, recentring and wraparound happen early
+ARRAYS = {
+    'IndexedArray': lambda items: IndexedArray(items, capacity=1),
+    'TypedIndexedArray': lambda items: TypedIndexedArray('q', items, capacity=1),
+    'Queue': lambda items: Queue(items, capacity=1),
+}
+
+
+def check_consistent(lst, model):
+    assert lst.length() == len(model)
+    assert lst.size == len(model)
+    assert len(lst) == len(model)
+    assert lst.is_empty() == (not model)
+    nodes = []
+    current = lst.head
+    while current:
+        nodes.append(current)
+        current = current.next
+    assert [node.data for node in nodes] == model
+    if isinstance(lst, SinglyLinkedList) and lst.is_indexed():
+        assert lst._predecessors == dict(zip(nodes, [None] + nodes[:-1]))
+    if not model:
+        assert lst.head is None and lst.tail is None
+        return
+    assert lst.tail is nodes[-1]
+    assert lst.tail.next is None
+    assert lst.find_start() == model[0]
+    assert lst.find_end() == model[-1]
+    if isinstance(lst, DoublyLinkedList):
+        assert lst.head.prev is None
+        backwards = []
+        current = lst.tail
+        while current:
+            backwards.append(current.data)
+            current = current.prev
+        assert backwards == model[::-1]
+
+
+def check_array_consistent(structure, model):
+    assert len(structure) == structure.size == len(model)
+    assert structure.is_empty() == (not model)
+    assert list(structure) == model
+    assert [structure.find_at(i) for i in range(len(model))] == model
+    if model:
+        assert structure.find_start() == model[0]
+        assert structure.find_end() == model[-1]
+    assert structure.size <= structure.capacity == len(structure.data)
+    if isinstance(structure, Queue):
+        assert 0 <= structure.front < max(1, structure.capacity)
+    else:
+        assert list(reversed(structure)) == model[::-1]
+        assert 0 <= structure.start and structure.start + structure.size <= structure.capacity
+        live = range(structure.start, structure.start + structure.size)
+        assert all(structure.data[pos] == structure._empty
+                   for pos in range(structure.capacity) if pos not in live)
+
+
+def model_key_index(model, key):
+    try:
+        return model.index(key)
+    except ValueError:
+        return None
+
+
+def apply_random_op(lst, model, rng):
+    op = rng.choice([
+        'insert_start', 'insert_end', 'insert_at', 'insert_before_key', 'insert_after_key',
+        'update_key', 'update_at', 'remove_start', 'remove_end', 'remove_at', 'remove_key',
+        'extend', 'insert_many_at', 'remove_range', 'clear',
+    ])
+    item = rng.randrange(10)
+    key = rng.randrange(10)
+    if op == 'insert_start':
+        lst.insert_start(item)
+        model.insert(0, item)
+    elif op == 'insert_end':
+        lst.insert_end(item)
+        model.append(item)
+    elif op == 'insert_at':
+        index = rng.randrange(len(model) + 1)
+        lst.insert_at(index, item)
+        model.insert(index, item)
+    elif op == 'insert_before_key':
+        lst.insert_before_key(key, item)
+        pos = model_key_index(model, key)
+        model.insert(len(model) if pos is None else pos, item)
+    elif op == 'insert_after_key':
+        lst.insert_after_key(key, item)
+        pos = model_key_index(model, key)
+        model.insert(len(model) if pos is None else pos + 1, item)
+    elif op == 'update_key':
+        pos = model_key_index(model, key)
+        if pos is None:
+            with pytest.raises(ValueError):
+                lst.update_key(key, item)
+        else:
+            lst.update_key(key, item)
+            model[pos] = item
+    elif op == 'update_at':
+        if not model:
+            with pytest.raises(IndexError):
+                lst.update_at(0, item)
+        else:
+            index = rng.randrange(len(model))
+            lst.update_at(index, item)
+            model[index] = item
+    elif op in ('remove_start', 'remove_end', 'remove_at'):
+        if not model:
+            args = (0,) if op == 'remove_at' else ()
+            with pytest.raises(IndexError):
+                getattr(lst, op)(*args)
+        elif op == 'remove_start':
+            assert lst.remove_start() == model.pop(0)
+        elif op == 'remove_end':
+            assert lst.remove_end() == model.pop()
+        else:
+            index = rng.randrange(len(model))
+            assert lst.remove_at(index) == model.pop(index)
+    elif op == 'remove_key':
+        pos = model_key_index(model, key)
+        assert lst.remove_key(key) == (None if pos is None else model.pop(pos))
+    elif op == 'extend':
+        items = [rng.randrange(10) for _ in range(rng.randrange(4))]
+        lst.extend(items)
+        model.extend(items)
+    elif op == 'insert_many_at':
+        items = [rng.randrange(10) for _ in range(rng.randrange(4))]
+        index = rng.randrange(len(model) + 1)
+        lst.insert_many_at(index, items)
+        model[index:index] = items
+    elif op == 'remove_range':
+        start = rng.randrange(len(model) + 1)
+        stop = rng.randrange(start, len(model) + 1)
+        lst.remove_range(start, stop)
+        del model[start:stop]
+    elif rng.random() < 0.2:
+        lst.clear()
+        model.clear()
+
+
+@pytest.mark.parametrize('cls', LISTS)
+@pytest.mark.parametrize('indexed', [False, True])
+@pytest.mark.parametrize('seed', range(20))
+def test_size_and_tail_follow_every_mutator(cls, indexed, seed):
+    rng = random.Random(seed)
+    initial = [rng.randrange(10) for _ in range(rng.randrange(6))]
+    lst = cls(initial)
+    if indexed:
+        lst.enable_index()
+    model = list(initial)
+    check_consistent(lst, model)
+    for _ in range(300):
+        apply_random_op(lst, model, rng)
+        check_consistent(lst, model)
+
+
+@pytest.mark.parametrize('name', ARRAYS)
+@pytest.mark.parametrize('indexed', [False, True])
+@pytest.mark.parametrize('seed', range(20))
+def test_array_structures_follow_every_mutator(name, indexed, seed):
+    rng = random.Random(seed)
+    initial = [rng.randrange(10) for _ in range(rng.randrange(6))]
+    structure = ARRAYS[name](initial)
+    if indexed:
+        structure.enable_index()
+    model = list(initial)
+    check_array_consistent(structure, model)
+    for _ in range(300):
+        apply_random_op(structure, model, rng)
+        check_array_consistent(structure, model)
+
+
+@pytest.mark.parametrize('name', ARRAYS)
+def test_fifo_use_reuses_front_slack(name):
+    structure = ARRAYS[name]([])
+    model = []
+    for i in range(3000):
+        structure.insert_end(i)
+        structure.insert_end(-i)
+        model += [i, -i]
+        assert structure.remove_start() == model.pop(0)
+    check_array_consistent(structure, model)
+    assert structure.capacity <= 2 * len(model)
+
+
+@pytest.mark.parametrize('cls', LISTS)
+def test_empty_list_operations(cls):
+    lst = cls()
+    check_consistent(lst, [])
+    for method in ('remove_start', 'remove_end', 'find_start', 'find_end'):
+        with pytest.raises(IndexError):
+            getattr(lst, method)()
+    lst.remove_key(1)
+    lst.remove_range(0, 0)
+    lst.extend([])
+    check_consistent(lst, [])
+
+
+@pytest.mark.parametrize('cls', LISTS)
+def test_single_element_keeps_head_and_tail_together(cls):
+    lst = cls([7])
+    assert lst.head is lst.tail
+    lst.remove_end()
+    check_consistent(lst, [])
+    lst.insert_end(1)
+    lst.insert_start(0)
+    check_consistent(lst, [0, 1])
+    lst.remove_start()
+    assert lst.head is lst.tail
+    check_consistent(lst, [1])
+
+
+@pytest.mark.parametrize('method', ['insert_end', 'insert_start'])
+def test_queue_grows_from_zero_capacity(method):
+    queue = Queue(capacity=0)
+    getattr(queue, method)(1)
+    getattr(queue, method)(2)
+    assert len(queue) == 2
+    assert sorted(queue) == [1, 2]
+
+
+@pytest.mark.parametrize('cls', [Queue, SinglyLinkedList, DoublyLinkedList])
+def test_contains_compares_items_with_or_without_index(cls):
+    structure = cls([('a', 1), ('b', 2)])
+    assert ('a', 1) in structure
+    assert 'a' not in structure
+    structure.enable_index(key=lambda pair: pair[0])
+    assert ('a', 1) in structure
+    assert 'a' not in structure
+    structure.disable_index()
+    structure.enable_index()
+    assert ('b', 2) in structure
+    assert ('b', 3) not in structure
@@ -0,0 +1,76 @@
+import argparse
+import random
+import time
+from array import array
+
+from calculadora_matrizes import MatrizGeral, np
+
+
+def mul_ijk_elementos(a, b):
+    # implementação original: laço i-j-k com getelemento no laço interno
+    resultado = MatrizGeral(a.linhas, b.colunas)
+    for i in range(a.linhas):
+        for j in range(b.colunas):
+            soma = 0.0
+            for k in range(a.colunas):
+                soma += a.getelemento(i, k) * b.getelemento(k, j)
+            resultado.setelemento(i, j, soma)
+    return resultado
+
+
+def mul_ijk_plano(a, b):
+    # laço i-j-k direto sobre o buffer contíguo, sem blocos nem transposição
+    x = a._plano()
+    y = b._plano()
+    n = a.colunas
+    p = b.colunas
+    plano = array('d', bytes(8 * a.linhas * p))
+    for i in range(a.linhas):
+        base = i * n
+        for j in range(p):
+            soma = 0.0
+            for k in range(n):
+                soma += x[base + k] * y[k * p + j]
+            plano[i * p + j] = soma
+    return MatrizGeral._de_plano(a.linhas, p, plano)
+
+
+def aleatoria(n, gerador):
+    return MatrizGeral(n, n, [[gerador.random() for _ in range(n)] for _ in range(n)])
+
+
+def cronometrar(funcao, *argumentos):
+    inicio = time.perf_counter()
+    resultado = funcao(*argumentos)
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multiplicação em blocos x laço i-j-k")
+    parser.add_argument("-n", "--tamanhos", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    parser.add_argument("--limite-elementos", type=int, default=128,
+                        help="maior tamanho em que o i-j-k com getelemento ainda é medido")
+    parser.add_argument("-s", "--semente", type=int, default=0)
+    argumentos = parser.parse_args()
+
+    gerador = random.Random(argumentos.semente)
+    cabecalho = f"{'n':>5} {'i-j-k getelemento':>18} {'i-j-k plano':>12} {'em blocos':>10}"
+    print(cabecalho + (f" {'numpy':>10}" if np is not None else ""))
+    for n in argumentos.tamanhos:
+        a = aleatoria(n, gerador)
+        b = aleatoria(n, gerador)
+        tempo_blocos, referencia = cronometrar(a._mul_python, b)
+        tempo_plano, resultado = cronometrar(mul_ijk_plano, a, b)
+        assert all(abs(x - y) < 1e-9 * n for x, y in zip(resultado._plano(), referencia._plano()))
+        if n <= argumentos.limite_elementos:
+            tempo_elementos = f"{cronometrar(mul_ijk_elementos, a, b)[0]:>17.4f}s"
+        else:
+            tempo_elementos = f"{'-':>18}"
+        linha = f"{n:>5} {tempo_elementos} {tempo_plano:>11.4f}s {tempo_blocos:>9.4f}s"
+        if np is not None:
+            linha += f" {cronometrar(a.mul, b)[0]:>9.4f}s"
+        print(linha)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import random
+import time
+import tracemalloc
+
+from calculadora_matrizes import MatrizGeral
+
+
+def cadeia(inicial, operandos, comprimento):
+    # A.add(B).mul(2).transposta().sub(C)... repetido até o comprimento pedido
+    resultado = inicial
+    for passo in range(comprimento):
+        operando = operandos[passo % len(operandos)]
+        etapa = passo % 4
+        if etapa == 0:
+            resultado = resultado.add(operando)
+        elif etapa == 1:
+            resultado = resultado.mul(2)
+        elif etapa == 2:
+            resultado = resultado.transposta()
+        else:
+            resultado = resultado.sub(operando)
+    return resultado
+
+
+def medir(funcao):
+    # tempo e memória em execuções separadas: o tracemalloc pesa em cada alocação
+    inicio = time.perf_counter()
+    funcao()
+    duracao = time.perf_counter() - inicio
+    tracemalloc.start()
+    funcao()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return duracao, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cadeias de expressões: avaliação imediata x preguiçosa")
+    parser.add_argument("-n", "--tamanho", type=int, default=200, help="ordem das matrizes quadradas")
+    parser.add_argument("-c", "--comprimentos", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("-s", "--semente", type=int, default=0)
+    argumentos = parser.parse_args()
+
+    gerador = random.Random(argumentos.semente)
+    n = argumentos.tamanho
+    matrizes = [MatrizGeral(n, n, [[gerador.random() for _ in range(n)] for _ in range(n)]) for _ in range(4)]
+    inicial, operandos = matrizes[0], matrizes[1:]
+
+    print(f"{'passos':>7} {'imediata':>10} {'pico':>10} {'preguiçosa':>11} {'pico':>10}   ({n}x{n})")
+    for comprimento in argumentos.comprimentos:
+        tempo_imediato, pico_imediato = medir(lambda: cadeia(inicial, operandos, comprimento))
+        tempo_preguicoso, pico_preguicoso = medir(
+            lambda: cadeia(inicial.preguicosa(), operandos, comprimento).avaliar())
+        print(f"{comprimento:>7} {tempo_imediato:>9.3f}s {pico_imediato / 2 ** 20:>7.2f} MB "
+              f"{tempo_preguicoso:>10.3f}s {pico_preguicoso / 2 ** 20:>7.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,108 @@
 from abc import ABC, abstractmethod
 from typing import List
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
+from mmap import mmap as _mmap_arquivo, ACCESS_COPY, ACCESS_WRITE
+from multiprocessing import shared_memory
 import copy
-from linear_structures import IndexedArray
+import operator
+import os
+import struct
+import sys
+import tempfile
+import time
+from linear_structures import TypedIndexedArray
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# formato binário: cabeçalho fixo, nome em UTF-8, enchimento até 8 bytes e
+# os valores linha a linha na ordem de bytes indicada no cabeçalho
+_ASSINATURA = b"MTZ1"
+_CABECALHO = struct.Struct("<4sccHQQ")
+_ORDEM_NATIVA = b"<" if sys.byteorder == "little" else b">"
+
+
+def _deslocamento_dados(tamanho_nome):
+    return -(-(_CABECALHO.size + tamanho_nome) // 8) * 8
+
+
+def _gravar_matriz(caminho, linhas, colunas, nome, blocos):
+    # grava em um temporário no mesmo diretório e só então o põe no lugar:
+    # a matriz de origem pode estar mapeada a partir do próprio destino
+    nome_codificado = nome.encode("utf-8")
+    descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(caminho)), suffix=".tmp")
+    try:
+        with os.fdopen(descritor, "wb") as arquivo:
+            arquivo.write(_CABECALHO.pack(_ASSINATURA, b"d", _ORDEM_NATIVA, len(nome_codificado), linhas, colunas))
+            arquivo.write(nome_codificado)
+            arquivo.write(bytes(_deslocamento_dados(len(nome_codificado)) - _CABECALHO.size - len(nome_codificado)))
+            for bloco in blocos:
+                arquivo.write(bloco)
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+
+def _blocos_de_texto(arquivo, linhas_por_bloco, delimitador=None):
+    # sem delimitador, vírgula se a primeira linha tiver uma; senão espaços
+    bloco = []
+    for linha in arquivo:
+        if not linha.strip():
+            continue
+        if delimitador is None:
+            delimitador = "," if "," in linha else ""
+        bloco.append(linha.split(delimitador) if delimitador else linha.split())
+        if len(bloco) == linhas_por_bloco:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+
+def _anexar_memoria(nome):
+    try:
+        return shared_memory.SharedMemory(name=nome, track=False)
+    except TypeError:
+        # antes do Python 3.13 os filhos usam o rastreador do processo pai,
+        # então o registro repetido é inofensivo e o unlink do pai o remove
+        return shared_memory.SharedMemory(name=nome)
+
+
+_colunas_em_cache = {}
+
+
+def _mul_bloco_compartilhado(nomes, dimensoes, inicio, fim):
+    m, n, p = dimensoes
+    memorias = [_anexar_memoria(nome) for nome in nomes]
+    a, bt, c = (memoria.buf.cast('d') for memoria in memorias)
+    try:
+        if np is not None:
+            matriz_a = np.frombuffer(a, dtype=np.float64).reshape(m, n)
+            matriz_bt = np.frombuffer(bt, dtype=np.float64).reshape(p, n)
+            saida = np.frombuffer(c, dtype=np.float64).reshape(m, p)
+            saida[inicio:fim] = matriz_a[inicio:fim] @ matriz_bt.T
+            del matriz_a, matriz_bt, saida
+            return
+        # cada processo converte as colunas de B uma única vez por multiplicação
+        colunas = _colunas_em_cache.get(nomes[1])
+        if colunas is None:
+            _colunas_em_cache.clear()
+            colunas = _colunas_em_cache[nomes[1]] = [bt[j * n:(j + 1) * n].tolist() for j in range(p)]
+        for i in range(inicio, fim):
+            linha = a[i * n:(i + 1) * n].tolist()
+            c[i * p:(i + 1) * p] = array('d', [sum(map(operator.mul, linha, coluna)) for coluna in colunas])
+    finally:
+        a.release()
+        bt.release()
+        c.release()
+        for memoria in memorias:
+            memoria.close()
+
 
 class MatrizABC(ABC):
     def __init__(self, linhas: int, colunas: int, nome: str):
@@ -45,24 +146,132 @@ class MatrizABC(ABC):
     def getelemento(self, i, j):
         pass
 
+    def _nao_nulos(self):
+        for i in range(self.linhas):
+            for j in range(self.colunas):
+                valor = self.getelemento(i, j)
+                if valor != 0:
+                    yield i, j, valor
+
+    def _densa(self):
+        resultado = MatrizGeral(self.linhas, self.colunas, nome=self.nome)
+        for i, j, valor in self._nao_nulos():
+            resultado.setelemento(i, j, valor)
+        return resultado
+
+    def _escalar_linhas(self, fatores):
+        return self._densa()._escalar_linhas(fatores)
+
+    def _escalar_colunas(self, fatores):
+        return self._densa()._escalar_colunas(fatores)
+
+    def _linhas_densas(self):
+        linhas = [[0.0] * self.colunas for _ in range(self.linhas)]
+        for i, j, valor in self._nao_nulos():
+            linhas[i][j] = valor
+        return linhas
+
+    def _checar_dimensoes(self, other, operacao):
+        if not isinstance(other, MatrizABC):
+            raise TypeError("Operação somente entre matrizes")
+        if self.linhas != other.linhas or self.colunas != other.colunas:
+            raise ValueError(f"Dimensões incompatíveis para {operacao}")
+
+    def _mul_esquerda_esparsa(self, other):
+        # percorre só os não nulos de self: custo O(nnz(self) * colunas(other))
+        if self.colunas != other.linhas:
+            raise ValueError("Dimensões incompatíveis para multiplicação")
+        if isinstance(other, MatrizGeral):
+            b = other._plano()
+            p = other.colunas
+            linhas_b = [b[k * p:(k + 1) * p].tolist() for k in range(other.linhas)]
+        else:
+            linhas_b = other._linhas_densas()
+        resultado = [None] * self.linhas
+        for i, k, valor in self._nao_nulos():
+            parcela = map(operator.mul, repeat(valor), linhas_b[k])
+            if resultado[i] is None:
+                resultado[i] = list(parcela)
+            else:
+                resultado[i] = list(map(operator.add, resultado[i], parcela))
+        plano = array('d')
+        zeros = array('d', bytes(8 * other.colunas))
+        for linha in resultado:
+            plano.extend(zeros if linha is None else array('d', linha))
+        return MatrizGeral._de_plano(self.linhas, other.colunas, plano)
+
+    def _imprimir_denso(self):
+        print(f"Matriz {self.nome} - {self.tipo()} {self.linhas}x{self.colunas}")
+        for i in range(self.linhas):
+            print(" ".join(f"{self.getelemento(i, j):.2f}" for j in range(self.colunas)))
+
 
 class MatrizGeral(MatrizABC):
+    TAMANHO_BLOCO = 64
+    BYTES_POR_BLOCO = 8 << 20
+    # visões de um lote dividem o buffer com outras visões e com o próprio
+    # lote, que podem alterá-lo sem passar por setelemento
+    _guardar_lu = True
+
     def __init__(self, linhas: int, colunas: int, dados: List[List[float]] = None, nome: str = ""):
         super().__init__(linhas, colunas, nome)
+        self._lu = None
+        # armazenamento contíguo, linha a linha, em um único buffer de doubles
+        self.dados = TypedIndexedArray('d', capacity=max(1, linhas * colunas))
         if dados:
-            self.dados = IndexedArray()
+            if len(dados) != linhas:
+                raise ValueError("Quantidade de linhas incompatível com os dados")
             for linha in dados:
-                arr_linha = IndexedArray()
-                for x in linha:
-                    arr_linha.insert_end(x)
-                self.dados.insert_end(arr_linha)
+                if len(linha) != colunas:
+                    raise ValueError("Quantidade de colunas incompatível com os dados")
+                self.dados.extend(linha)
         else:
-            self.dados = IndexedArray()
-            for _ in range(linhas):
-                linha = IndexedArray()
-                for _ in range(colunas):
-                    linha.insert_end(0.0)
-                self.dados.insert_end(linha)
+            self.dados.extend(array('d', bytes(8 * linhas * colunas)))
+
+    @classmethod
+    def _de_plano(cls, linhas, colunas, plano, nome=""):
+        if np is not None and isinstance(plano, np.ndarray):
+            buffer = array('d')
+            buffer.frombytes(memoryview(np.ascontiguousarray(plano, dtype=np.float64).reshape(-1)).cast('B'))
+            plano = buffer
+        elif not isinstance(plano, array) or plano.typecode != 'd':
+            plano = array('d', plano)
+        matriz = cls.__new__(cls)
+        MatrizABC.__init__(matriz, linhas, colunas, nome)
+        matriz._lu = None
+        # o plano passa a pertencer à matriz, sem uma segunda cópia
+        matriz.dados = TypedIndexedArray.from_array(plano)
+        return matriz
+
+    @classmethod
+    def from_csv(cls, caminho, chunk_rows=32, delimitador=None, nome="", estatisticas=None):
+        inicio = time.perf_counter()
+        plano = array('d')
+        linhas = 0
+        colunas = None
+        with open(caminho, "r", encoding="utf-8") as arquivo:
+            for bloco in _blocos_de_texto(arquivo, chunk_rows, delimitador):
+                for partes in bloco:
+                    if colunas is None:
+                        colunas = len(partes)
+                    elif len(partes) != colunas:
+                        raise ValueError("Quantidade de colunas incompatível com os dados")
+                # cada bloco vira doubles direto no plano; as strings são descartadas a seguir
+                plano.fromlist(list(map(float, chain.from_iterable(bloco))))
+                linhas += len(bloco)
+            tamanho = arquivo.tell()
+        if estatisticas is not None:
+            segundos = time.perf_counter() - inicio
+            estatisticas.update(linhas=linhas, colunas=colunas or 0, bytes=tamanho, segundos=segundos,
+                                mb_por_segundo=tamanho / 2 ** 20 / segundos if segundos else 0.0,
+                                valores_por_segundo=len(plano) / segundos if segundos else 0.0)
+        return cls._de_plano(linhas, colunas or 0, plano, nome)
+
+    def _plano(self):
+        return self.dados.as_memoryview()
+
+    def _numpy(self):
+        return np.frombuffer(self._plano(), dtype=np.float64).reshape(self.linhas, self.colunas)
 
     def add(self, other):
         if not isinstance(other, MatrizABC):
@@ -71,63 +280,990 @@ class MatrizGeral(MatrizABC):
             raise ValueError("Dimensões incompatíveis para soma")
         if type(self) == type(other):
             return self._soma_especializada(other)
-        resultado = MatrizGeral(self.linhas, self.colunas)
-        for i in range(self.linhas):
-            for j in range(self.colunas):
-                resultado.dados[i][j] = self.dados[i][j] + other.getelemento(i, j)
-        return resultado
+        return self._somar_nao_nulos(other, 1.0)
+
+    def _somar_nao_nulos(self, other, sinal):
+        plano = array('d', self._plano())
+        for i, j, valor in other._nao_nulos():
+            plano[i * self.colunas + j] += sinal * valor
+        return MatrizGeral._de_plano(self.linhas, self.colunas, plano)
 
     def _soma_especializada(self, other):
-        resultado = MatrizGeral(self.linhas, self.colunas)
-        for i in range(self.linhas):
-            for j in range(self.colunas):
-                resultado.dados[i][j] = self.dados[i][j] + other.dados[i][j]
-        return resultado
+        if np is not None:
+            return MatrizGeral._de_plano(self.linhas, self.colunas, self._numpy() + other._numpy())
+        plano = array('d', map(operator.add, self._plano(), other._plano()))
+        return MatrizGeral._de_plano(self.linhas, self.colunas, plano)
 
     def sub(self, other):
+        if not isinstance(other, MatrizABC):
+            raise TypeError("Operação somente entre matrizes")
         if self.linhas != other.linhas or self.colunas != other.colunas:
             raise ValueError("Dimensões incompatíveis para subtração")
-        resultado = MatrizGeral(self.linhas, self.colunas)
+        if isinstance(other, MatrizGeral):
+            if np is not None:
+                return MatrizGeral._de_plano(self.linhas, self.colunas, self._numpy() - other._numpy())
+            plano = array('d', map(operator.sub, self._plano(), other._plano()))
+            return MatrizGeral._de_plano(self.linhas, self.colunas, plano)
+        return self._somar_nao_nulos(other, -1.0)
+
+    def mul(self, other):
+        if isinstance(other, (int, float)):
+            if np is not None:
+                return MatrizGeral._de_plano(self.linhas, self.colunas, self._numpy() * other)
+            plano = array('d', map(operator.mul, self._plano(), repeat(other)))
+            return MatrizGeral._de_plano(self.linhas, self.colunas, plano)
+        elif isinstance(other, MatrizABC):
+            if self.colunas != other.linhas:
+                raise ValueError("Dimensões incompatíveis para multiplicação")
+            if isinstance(other, MatrizGeral):
+                if np is not None:
+                    return MatrizGeral._de_plano(self.linhas, other.colunas, self._numpy() @ other._numpy())
+                return self._mul_python(other)
+            if isinstance(other, MatrizDiagonal):
+                return self._escalar_colunas(other._valores())
+            return self._mul_direita_esparsa(other)
+        else:
+            raise TypeError("Multiplicação inválida")
+
+    def _mul_python(self, other):
+        m = self.linhas
+        n = self.colunas
+        p = other.colunas
+        a = self._plano()
+        b = other._plano()
+        # linhas de A e colunas de B (B transposta) como listas contíguas
+        linhas_a = [a[i * n:(i + 1) * n].tolist() for i in range(m)]
+        colunas_b = [b[j::p].tolist() for j in range(p)]
+        plano = array('d', bytes(8 * m * p))
+        bloco = self.TAMANHO_BLOCO
+        for i0 in range(0, m, bloco):
+            for j0 in range(0, p, bloco):
+                colunas = colunas_b[j0:j0 + bloco]
+                for i in range(i0, min(i0 + bloco, m)):
+                    linha = linhas_a[i]
+                    inicio = i * p + j0
+                    plano[inicio:inicio + len(colunas)] = array(
+                        'd', [sum(map(operator.mul, linha, coluna)) for coluna in colunas])
+        return MatrizGeral._de_plano(m, p, plano)
+
+    def mul_paralelo(self, other, trabalhadores=None, linhas_por_bloco=None):
+        if not isinstance(other, MatrizABC):
+            raise TypeError("Multiplicação paralela somente entre matrizes")
+        if self.colunas != other.linhas:
+            raise ValueError("Dimensões incompatíveis para multiplicação")
+        if not isinstance(other, MatrizGeral):
+            other = other._densa()
+        m, n, p = self.linhas, self.colunas, other.colunas
+        if m * n * p == 0:
+            return self.mul(other)
+        trabalhadores = trabalhadores or os.cpu_count() or 1
+        if linhas_por_bloco is None:
+            linhas_por_bloco = max(1, -(-m // (4 * trabalhadores)))
+        # operandos vão uma vez para a memória compartilhada; B vai transposta
+        # para que cada coluna seja contígua
+        fontes = (self._plano(), other.transposta()._plano(), None)
+        memorias = []
+        try:
+            for fonte, tamanho in zip(fontes, (m * n, p * n, m * p)):
+                memoria = shared_memory.SharedMemory(create=True, size=8 * tamanho)
+                memorias.append(memoria)
+                if fonte is not None:
+                    destino = memoria.buf.cast('d')
+                    destino[:] = fonte
+                    destino.release()
+            nomes = tuple(memoria.name for memoria in memorias)
+            with ProcessPoolExecutor(max_workers=trabalhadores) as executor:
+                tarefas = [executor.submit(_mul_bloco_compartilhado, nomes, (m, n, p), inicio,
+                                           min(inicio + linhas_por_bloco, m))
+                           for inicio in range(0, m, linhas_por_bloco)]
+                for tarefa in tarefas:
+                    tarefa.result()
+            saida = memorias[2].buf.cast('d')
+            plano = array('d', saida)
+            saida.release()
+        finally:
+            for memoria in memorias:
+                memoria.close()
+                memoria.unlink()
+        return MatrizGeral._de_plano(m, p, plano)
+
+    def _mul_direita_esparsa(self, other):
+        # coluna j do resultado acumula coluna k de self vezes cada não nulo (k, j)
+        a = self._plano()
+        n = self.colunas
+        colunas_a = {}
+        colunas = {}
+        for k, j, valor in other._nao_nulos():
+            coluna_a = colunas_a.get(k)
+            if coluna_a is None:
+                coluna_a = colunas_a[k] = a[k::n].tolist()
+            parcela = map(operator.mul, coluna_a, repeat(valor))
+            if j in colunas:
+                colunas[j] = list(map(operator.add, colunas[j], parcela))
+            else:
+                colunas[j] = list(parcela)
+        p = other.colunas
+        plano = array('d', bytes(8 * self.linhas * p))
+        for j, coluna in colunas.items():
+            plano[j::p] = array('d', coluna)
+        return MatrizGeral._de_plano(self.linhas, p, plano)
+
+    def _escalar_linhas(self, fatores):
+        a = self._plano()
+        n = self.colunas
+        plano = array('d')
         for i in range(self.linhas):
-            for j in range(self.colunas):
-                resultado.dados[i][j] = self.dados[i][j] - other.getelemento(i, j)
-        return resultado
+            plano.extend(map(operator.mul, a[i * n:(i + 1) * n], repeat(fatores[i])))
+        return MatrizGeral._de_plano(self.linhas, n, plano)
+
+    def _escalar_colunas(self, fatores):
+        a = self._plano()
+        n = self.colunas
+        plano = array('d')
+        for i in range(self.linhas):
+            plano.extend(map(operator.mul, a[i * n:(i + 1) * n], fatores))
+        return MatrizGeral._de_plano(self.linhas, n, plano)
+
+    def _nao_nulos(self):
+        a = self._plano()
+        n = self.colunas
+        for posicao, valor in enumerate(a):
+            if valor != 0:
+                yield posicao // n, posicao % n, valor
+
+    def transposta(self):
+        if np is not None:
+            return MatrizGeral._de_plano(self.colunas, self.linhas, self._numpy().T)
+        a = self._plano()
+        plano = array('d')
+        for j in range(self.colunas):
+            plano.extend(a[j::self.colunas])
+        return MatrizGeral._de_plano(self.colunas, self.linhas, plano)
+
+    def preguicosa(self):
+        return MatrizPreguicosa(self.linhas, self.colunas, [(1.0, self, False)], self.nome)
+
+    def salvar(self, caminho):
+        _gravar_matriz(caminho, self.linhas, self.colunas, self.nome, [self._plano()])
+
+    @classmethod
+    def carregar(cls, caminho, mmap=True, gravavel=False):
+        with open(caminho, "rb") as arquivo:
+            cabecalho = arquivo.read(_CABECALHO.size)
+            if len(cabecalho) < _CABECALHO.size:
+                raise ValueError("Arquivo não contém uma matriz válida")
+            assinatura, tipo, ordem, tamanho_nome, linhas, colunas = _CABECALHO.unpack(cabecalho)
+            if assinatura != _ASSINATURA or tipo != b"d":
+                raise ValueError("Arquivo não contém uma matriz válida")
+            nome = arquivo.read(tamanho_nome).decode("utf-8")
+            inicio = _deslocamento_dados(tamanho_nome)
+            fim = inicio + 8 * linhas * colunas
+            if not mmap or ordem != _ORDEM_NATIVA:
+                arquivo.seek(inicio)
+                plano = array('d')
+                plano.frombytes(arquivo.read(fim - inicio))
+                if len(plano) != linhas * colunas:
+                    raise ValueError("Arquivo de matriz truncado")
+                if ordem != _ORDEM_NATIVA:
+                    plano.byteswap()
+                return cls._de_plano(linhas, colunas, plano, nome)
+        with open(caminho, "r+b" if gravavel else "rb") as arquivo:
+            # sem gravavel as alterações ficam só na memória (cópia na escrita)
+            mapa = _mmap_arquivo(arquivo.fileno(), 0, access=ACCESS_WRITE if gravavel else ACCESS_COPY)
+        if len(mapa) < fim:
+            mapa.close()
+            raise ValueError("Arquivo de matriz truncado")
+        matriz = cls.__new__(cls)
+        MatrizABC.__init__(matriz, linhas, colunas, nome)
+        matriz._lu = None
+        matriz._mapa = mapa
+        vista = memoryview(mapa)[inicio:fim]
+        matriz.dados = TypedIndexedArray.from_buffer('d', vista)
+        vista.release()
+        return matriz
+
+    def fechar(self):
+        mapa = getattr(self, "_mapa", None)
+        if mapa is None:
+            return
+        self.dados.release()
+        self._mapa = None
+        try:
+            mapa.close()
+        except BufferError:
+            # ainda há visões de _plano() ou _numpy() vivas; o mapeamento é
+            # desfeito quando a última delas for coletada
+            pass
+
+    def _linhas_por_bloco(self, largura):
+        return max(1, self.BYTES_POR_BLOCO // (8 * max(1, largura)))
+
+    def _blocos_de_linhas(self, linhas_por_bloco):
+        a = self._plano()
+        n = self.colunas
+        for inicio in range(0, self.linhas, linhas_por_bloco):
+            fim = min(inicio + linhas_por_bloco, self.linhas)
+            yield inicio, a[inicio * n:fim * n]
+
+    def somar_em_arquivo(self, other, caminho, linhas_por_bloco=None):
+        self._checar_dimensoes(other, "soma")
+        if not isinstance(other, MatrizGeral):
+            other = other._densa()
+        linhas_por_bloco = linhas_por_bloco or self._linhas_por_bloco(self.colunas)
+        b = other._plano()
+        n = self.colunas
+        blocos = (array('d', map(operator.add, bloco, b[inicio * n:inicio * n + len(bloco)]))
+                  for inicio, bloco in self._blocos_de_linhas(linhas_por_bloco))
+        _gravar_matriz(caminho, self.linhas, self.colunas, self.nome, blocos)
+        return MatrizGeral.carregar(caminho)
+
+    def mul_escalar_em_arquivo(self, escalar, caminho, linhas_por_bloco=None):
+        linhas_por_bloco = linhas_por_bloco or self._linhas_por_bloco(self.colunas)
+        blocos = (array('d', map(operator.mul, bloco, repeat(escalar)))
+                  for _, bloco in self._blocos_de_linhas(linhas_por_bloco))
+        _gravar_matriz(caminho, self.linhas, self.colunas, self.nome, blocos)
+        return MatrizGeral.carregar(caminho)
+
+    def transposta_em_arquivo(self, caminho, linhas_por_bloco=None):
+        # cada bloco de linhas da saída é uma faixa de colunas da entrada,
+        # lida linha a linha para percorrer o arquivo de forma sequencial
+        m, n = self.linhas, self.colunas
+        linhas_por_bloco = linhas_por_bloco or self._linhas_por_bloco(m)
+        a = self._plano()
+
+        def blocos():
+            for j0 in range(0, n, linhas_por_bloco):
+                j1 = min(j0 + linhas_por_bloco, n)
+                bloco = array('d', bytes(8 * (j1 - j0) * m))
+                for i in range(m):
+                    bloco[i::m] = array('d', a[i * n + j0:i * n + j1])
+                yield bloco
+
+        _gravar_matriz(caminho, n, m, self.nome, blocos())
+        return MatrizGeral.carregar(caminho)
+
+    def _posicao(self, i, j):
+        if not (0 <= i < self.linhas and 0 <= j < self.colunas):
+            raise IndexError("Posição fora da matriz")
+        return i * self.colunas + j
+
+    def getelemento(self, i, j):
+        return self.dados.find_at(self._posicao(i, j))
+
+    def setelemento(self, i, j, valor):
+        self.dados.update_at(self._posicao(i, j), valor)
+        self._lu = None
+
+    def _fatoracao_lu(self):
+        # LU com pivoteamento parcial, guardada até a próxima alteração da matriz
+        if self._lu is not None:
+            return self._lu
+        if not self.ehquadrada():
+            raise ValueError("Fatoração LU só para matrizes quadradas")
+        n = self.linhas
+        a = self._plano()
+        lu = [a[i * n:(i + 1) * n].tolist() for i in range(n)]
+        permutacao = list(range(n))
+        sinal = 1.0
+        singular = False
+        for k in range(n):
+            p = max(range(k, n), key=lambda r: abs(lu[r][k]))
+            if lu[p][k] == 0:
+                singular = True
+                continue
+            if p != k:
+                lu[k], lu[p] = lu[p], lu[k]
+                permutacao[k], permutacao[p] = permutacao[p], permutacao[k]
+                sinal = -sinal
+            linha_k = lu[k]
+            pivo = linha_k[k]
+            resto_k = linha_k[k + 1:]
+            for r in range(k + 1, n):
+                linha = lu[r]
+                fator = linha[k] / pivo
+                linha[k] = fator
+                if fator:
+                    linha[k + 1:] = map(operator.sub, linha[k + 1:], map(operator.mul, repeat(fator), resto_k))
+        fatoracao = (lu, permutacao, sinal, singular)
+        if self._guardar_lu:
+            self._lu = fatoracao
+        return fatoracao
+
+    def determinante(self):
+        lu, _, sinal, singular = self._fatoracao_lu()
+        if singular:
+            return 0.0
+        produto = sinal
+        for i in range(self.linhas):
+            produto *= lu[i][i]
+        return produto
+
+    def _resolver_vetor(self, b, fatoracao):
+        lu, permutacao, _, singular = fatoracao
+        if singular:
+            raise ValueError("Matriz singular")
+        n = self.linhas
+        y = [0.0] * n
+        for i in range(n):
+            linha = lu[i]
+            y[i] = b[permutacao[i]] - sum(map(operator.mul, linha[:i], y[:i]))
+        x = [0.0] * n
+        for i in range(n - 1, -1, -1):
+            linha = lu[i]
+            x[i] = (y[i] - sum(map(operator.mul, linha[i + 1:], x[i + 1:]))) / linha[i]
+        return x
+
+    def resolver(self, b):
+        if isinstance(b, MatrizABC):
+            if b.linhas != self.linhas:
+                raise ValueError("Dimensões incompatíveis para resolver o sistema")
+            fatoracao = self._fatoracao_lu()
+            colunas = [self._resolver_vetor([b.getelemento(i, j) for i in range(b.linhas)], fatoracao)
+                       for j in range(b.colunas)]
+            plano = array('d', bytes(8 * self.colunas * b.colunas))
+            for j, coluna in enumerate(colunas):
+                plano[j::b.colunas] = array('d', coluna)
+            return MatrizGeral._de_plano(self.colunas, b.colunas, plano)
+        if len(b) != self.linhas:
+            raise ValueError("Dimensões incompatíveis para resolver o sistema")
+        return self._resolver_vetor(b, self._fatoracao_lu())
+
+    def inversa(self):
+        n = self.linhas
+        identidade = MatrizDiagonal(n, [1.0] * n)
+        return self.resolver(identidade)
+
+    def imprimir(self):
+        print(f"Matriz {self.nome} - {self.tipo()} {self.linhas}x{self.colunas}")
+        a = self._plano()
+        for i in range(self.linhas):
+            linha = a[i * self.colunas:(i + 1) * self.colunas]
+            print(" ".join(f"{x:.2f}" for x in linha))
+
+
+class MatrizDiagonal(MatrizABC):
+    def __init__(self, n: int, diagonal: List[float] = None, nome: str = ""):
+        super().__init__(n, n, nome)
+        if diagonal is not None and len(diagonal) != n:
+            raise ValueError("Tamanho da diagonal incompatível")
+        valores = diagonal if diagonal is not None else array('d', bytes(8 * n))
+        self._diagonal = TypedIndexedArray('d', valores, capacity=max(1, n))
+
+    @classmethod
+    def _de_diagonal(cls, valores, nome=""):
+        return cls(len(valores), valores, nome)
+
+    def _valores(self):
+        return self._diagonal.as_memoryview()
+
+    def getelemento(self, i, j):
+        if not (0 <= i < self.linhas and 0 <= j < self.colunas):
+            raise IndexError("Posição fora da matriz")
+        return self._diagonal.find_at(i) if i == j else 0.0
+
+    def setelemento(self, i, j, valor):
+        if i != j:
+            raise ValueError("Matriz diagonal só aceita valores na diagonal")
+        self._diagonal.update_at(i, valor)
+
+    def _nao_nulos(self):
+        for i, valor in enumerate(self._valores()):
+            if valor != 0:
+                yield i, i, valor
+
+    def add(self, other):
+        self._checar_dimensoes(other, "soma")
+        if isinstance(other, MatrizDiagonal):
+            return MatrizDiagonal._de_diagonal(array('d', map(operator.add, self._valores(), other._valores())))
+        if isinstance(other, MatrizGeral):
+            return other.add(self)
+        return self._densa().add(other)
+
+    def sub(self, other):
+        self._checar_dimensoes(other, "subtração")
+        if isinstance(other, MatrizDiagonal):
+            return MatrizDiagonal._de_diagonal(array('d', map(operator.sub, self._valores(), other._valores())))
+        return self._densa().sub(other)
 
     def mul(self, other):
         if isinstance(other, (int, float)):
-            resultado = MatrizGeral(self.linhas, self.colunas)
-            for i in range(self.linhas):
-                for j in range(self.colunas):
-                    resultado.dados[i][j] = self.dados[i][j] * other
-            return resultado
+            return MatrizDiagonal._de_diagonal(array('d', map(operator.mul, self._valores(), repeat(other))))
         elif isinstance(other, MatrizABC):
             if self.colunas != other.linhas:
                 raise ValueError("Dimensões incompatíveis para multiplicação")
-            resultado = MatrizGeral(self.linhas, other.colunas)
-            for i in range(self.linhas):
-                for j in range(other.colunas):
-                    soma = 0.0
-                    for k in range(self.colunas):
-                        soma += self.dados[i][k] * other.getelemento(k, j)
-                    resultado.dados[i][j] = soma
-            return resultado
+            # D * X só escala as linhas de X e mantém a estrutura de X
+            return other._escalar_linhas(self._valores())
         else:
             raise TypeError("Multiplicação inválida")
 
+    def _escalar_linhas(self, fatores):
+        return MatrizDiagonal._de_diagonal(array('d', map(operator.mul, self._valores(), fatores)))
+
+    def _escalar_colunas(self, fatores):
+        return self._escalar_linhas(fatores)
+
     def transposta(self):
-        resultado = MatrizGeral(self.colunas, self.linhas)
+        return MatrizDiagonal._de_diagonal(array('d', self._valores()))
+
+    def tra(self):
+        return sum(self._valores())
+
+    def determinante(self):
+        produto = 1.0
+        for valor in self._valores():
+            produto *= valor
+        return produto
+
+    def imprimir(self):
+        self._imprimir_denso()
+
+
+class _MatrizTriangular(MatrizABC):
+    def __init__(self, n: int, dados: List[List[float]] = None, nome: str = ""):
+        super().__init__(n, n, nome)
+        self._dados = TypedIndexedArray('d', capacity=max(1, n * (n + 1) // 2))
+        if dados:
+            if len(dados) != n or any(len(linha) != n for linha in dados):
+                raise ValueError("Dados devem formar uma matriz quadrada")
+            for i, linha in enumerate(dados):
+                faixa = self._faixa(i)
+                for j, valor in enumerate(linha):
+                    if valor != 0 and j not in faixa:
+                        raise ValueError(f"Elemento ({i}, {j}) fora da parte triangular deve ser zero")
+                self._dados.extend(linha[faixa.start:faixa.stop])
+        else:
+            self._dados.extend(array('d', bytes(8 * (n * (n + 1) // 2))))
+
+    @classmethod
+    def _de_plano(cls, n, plano, nome=""):
+        matriz = cls.__new__(cls)
+        MatrizABC.__init__(matriz, n, n, nome)
+        matriz._dados = TypedIndexedArray('d', plano, capacity=max(1, len(plano)))
+        return matriz
+
+    def _plano(self):
+        return self._dados.as_memoryview()
+
+    def _linha(self, i):
+        inicio = self._inicio(i)
+        return self._plano()[inicio:inicio + len(self._faixa(i))]
+
+    def getelemento(self, i, j):
+        if not (0 <= i < self.linhas and 0 <= j < self.colunas):
+            raise IndexError("Posição fora da matriz")
+        faixa = self._faixa(i)
+        if j not in faixa:
+            return 0.0
+        return self._dados.find_at(self._inicio(i) + j - faixa.start)
+
+    def setelemento(self, i, j, valor):
+        faixa = self._faixa(i)
+        if j not in faixa:
+            raise ValueError("Posição fora da parte triangular")
+        self._dados.update_at(self._inicio(i) + j - faixa.start, valor)
+
+    def _nao_nulos(self):
         for i in range(self.linhas):
-            for j in range(self.colunas):
-                resultado.dados[j][i] = self.dados[i][j]
+            faixa = self._faixa(i)
+            for j, valor in zip(faixa, self._linha(i)):
+                if valor != 0:
+                    yield i, j, valor
+
+    def _mesmo_tipo(self, plano):
+        return type(self)._de_plano(self.linhas, plano)
+
+    def add(self, other):
+        self._checar_dimensoes(other, "soma")
+        if type(other) is type(self):
+            return self._mesmo_tipo(array('d', map(operator.add, self._plano(), other._plano())))
+        if isinstance(other, MatrizGeral):
+            return other.add(self)
+        if isinstance(other, MatrizDiagonal):
+            resultado = self._mesmo_tipo(array('d', self._plano()))
+            for i, _, valor in other._nao_nulos():
+                resultado.setelemento(i, i, resultado.getelemento(i, i) + valor)
+            return resultado
+        return self._densa().add(other)
+
+    def sub(self, other):
+        self._checar_dimensoes(other, "subtração")
+        if type(other) is type(self):
+            return self._mesmo_tipo(array('d', map(operator.sub, self._plano(), other._plano())))
+        return self._densa().sub(other)
+
+    def mul(self, other):
+        if isinstance(other, (int, float)):
+            return self._mesmo_tipo(array('d', map(operator.mul, self._plano(), repeat(other))))
+        elif isinstance(other, MatrizABC):
+            if self.colunas != other.linhas:
+                raise ValueError("Dimensões incompatíveis para multiplicação")
+            if type(other) is type(self):
+                return self._mul_mesmo_tipo(other)
+            if isinstance(other, MatrizDiagonal):
+                return self._escalar_colunas(other._valores())
+            return self._mul_esquerda_esparsa(other)
+        else:
+            raise TypeError("Multiplicação inválida")
+
+    def _mul_mesmo_tipo(self, other):
+        # produto de triangulares do mesmo lado continua triangular;
+        # cada termo só percorre k na interseção das faixas
+        n = self.linhas
+        colunas = [[other.getelemento(k, j) for k in range(n)] for j in range(n)]
+        plano = array('d')
+        for i in range(n):
+            faixa_i = self._faixa(i)
+            linha = self._linha(i).tolist()
+            for j in faixa_i:
+                faixa_j = other._faixa_coluna(j)
+                inicio = max(faixa_i.start, faixa_j.start)
+                fim = min(faixa_i.stop, faixa_j.stop)
+                plano.append(sum(map(operator.mul,
+                                     linha[inicio - faixa_i.start:fim - faixa_i.start],
+                                     colunas[j][inicio:fim])))
+        return self._mesmo_tipo(plano)
+
+    def _escalar_linhas(self, fatores):
+        plano = array('d')
+        for i in range(self.linhas):
+            plano.extend(map(operator.mul, self._linha(i), repeat(fatores[i])))
+        return self._mesmo_tipo(plano)
+
+    def _escalar_colunas(self, fatores):
+        plano = array('d')
+        for i in range(self.linhas):
+            faixa = self._faixa(i)
+            plano.extend(map(operator.mul, self._linha(i), fatores[faixa.start:faixa.stop]))
+        return self._mesmo_tipo(plano)
+
+    def _transposta_como(self, classe):
+        n = self.linhas
+        resultado = classe(n)
+        for i, j, valor in self._nao_nulos():
+            resultado.setelemento(j, i, valor)
         return resultado
 
+    def tra(self):
+        return sum(self.getelemento(i, i) for i in range(self.linhas))
+
+    def determinante(self):
+        produto = 1.0
+        for i in range(self.linhas):
+            produto *= self.getelemento(i, i)
+        return produto
+
+    def imprimir(self):
+        self._imprimir_denso()
+
+
+class MatrizTriangularSuperior(_MatrizTriangular):
+    def _faixa(self, i):
+        return range(i, self.colunas)
+
+    def _faixa_coluna(self, j):
+        return range(0, j + 1)
+
+    def _inicio(self, i):
+        return i * self.colunas - i * (i - 1) // 2
+
+    def transposta(self):
+        return self._transposta_como(MatrizTriangularInferior)
+
+
+class MatrizTriangularInferior(_MatrizTriangular):
+    def _faixa(self, i):
+        return range(0, i + 1)
+
+    def _faixa_coluna(self, j):
+        return range(j, self.linhas)
+
+    def _inicio(self, i):
+        return i * (i + 1) // 2
+
+    def transposta(self):
+        return self._transposta_como(MatrizTriangularSuperior)
+
+
+class MatrizEsparsa(MatrizABC):
+    def __init__(self, linhas: int, colunas: int, dados: List[List[float]] = None, nome: str = "",
+                 elementos=None):
+        super().__init__(linhas, colunas, nome)
+        # dicionário de chaves por linha: {i: {j: valor}}, só com não nulos
+        self._linhas = {}
+        if dados:
+            if len(dados) != linhas or any(len(linha) != colunas for linha in dados):
+                raise ValueError("Dimensões incompatíveis com os dados")
+            for i, linha in enumerate(dados):
+                for j, valor in enumerate(linha):
+                    if valor != 0:
+                        self._linhas.setdefault(i, {})[j] = valor
+        if elementos:
+            for (i, j), valor in elementos.items():
+                self.setelemento(i, j, valor)
+
+    @classmethod
+    def _de_linhas(cls, linhas, colunas, dicionario, nome=""):
+        matriz = cls(linhas, colunas, nome=nome)
+        matriz._linhas = {i: linha for i, linha in dicionario.items() if linha}
+        return matriz
+
+    def nnz(self):
+        return sum(len(linha) for linha in self._linhas.values())
+
     def getelemento(self, i, j):
-        return self.dados[i][j]
+        if not (0 <= i < self.linhas and 0 <= j < self.colunas):
+            raise IndexError("Posição fora da matriz")
+        linha = self._linhas.get(i)
+        return linha.get(j, 0.0) if linha else 0.0
+
+    def setelemento(self, i, j, valor):
+        if not (0 <= i < self.linhas and 0 <= j < self.colunas):
+            raise IndexError("Posição fora da matriz")
+        if valor != 0:
+            self._linhas.setdefault(i, {})[j] = valor
+            return
+        linha = self._linhas.get(i)
+        if linha and j in linha:
+            del linha[j]
+            if not linha:
+                del self._linhas[i]
+
+    def _nao_nulos(self):
+        for i, linha in self._linhas.items():
+            for j, valor in linha.items():
+                yield i, j, valor
+
+    def _combinar(self, other, sinal):
+        resultado = {i: dict(linha) for i, linha in self._linhas.items()}
+        for i, linha in other._linhas.items():
+            destino = resultado.setdefault(i, {})
+            for j, valor in linha.items():
+                soma = destino.get(j, 0.0) + sinal * valor
+                if soma != 0:
+                    destino[j] = soma
+                elif j in destino:
+                    del destino[j]
+        return MatrizEsparsa._de_linhas(self.linhas, self.colunas, resultado)
+
+    def add(self, other):
+        self._checar_dimensoes(other, "soma")
+        if isinstance(other, MatrizEsparsa):
+            return self._combinar(other, 1.0)
+        if isinstance(other, MatrizGeral):
+            return other.add(self)
+        return self._densa().add(other)
+
+    def sub(self, other):
+        self._checar_dimensoes(other, "subtração")
+        if isinstance(other, MatrizEsparsa):
+            return self._combinar(other, -1.0)
+        return self._densa().sub(other)
+
+    def mul(self, other):
+        if isinstance(other, (int, float)):
+            if other == 0:
+                return MatrizEsparsa(self.linhas, self.colunas)
+            return MatrizEsparsa._de_linhas(self.linhas, self.colunas, {
+                i: {j: valor * other for j, valor in linha.items()} for i, linha in self._linhas.items()})
+        elif isinstance(other, MatrizABC):
+            if self.colunas != other.linhas:
+                raise ValueError("Dimensões incompatíveis para multiplicação")
+            if isinstance(other, MatrizEsparsa):
+                return self._mul_esparsa(other)
+            if isinstance(other, MatrizDiagonal):
+                return self._escalar_colunas(other._valores())
+            return self._mul_esquerda_esparsa(other)
+        else:
+            raise TypeError("Multiplicação inválida")
+
+    def _mul_esparsa(self, other):
+        # custo proporcional às multiplicações efetivas entre não nulos
+        resultado = {}
+        for i, linha in self._linhas.items():
+            acumulado = {}
+            for k, valor in linha.items():
+                linha_b = other._linhas.get(k)
+                if not linha_b:
+                    continue
+                for j, outro in linha_b.items():
+                    acumulado[j] = acumulado.get(j, 0.0) + valor * outro
+            acumulado = {j: v for j, v in acumulado.items() if v != 0}
+            if acumulado:
+                resultado[i] = acumulado
+        return MatrizEsparsa._de_linhas(self.linhas, other.colunas, resultado)
+
+    def _escalar_linhas(self, fatores):
+        return MatrizEsparsa._de_linhas(self.linhas, self.colunas, {
+            i: {j: valor * fatores[i] for j, valor in linha.items() if valor * fatores[i] != 0}
+            for i, linha in self._linhas.items()})
+
+    def _escalar_colunas(self, fatores):
+        return MatrizEsparsa._de_linhas(self.linhas, self.colunas, {
+            i: {j: valor * fatores[j] for j, valor in linha.items() if valor * fatores[j] != 0}
+            for i, linha in self._linhas.items()})
+
+    def transposta(self):
+        resultado = {}
+        for i, j, valor in self._nao_nulos():
+            resultado.setdefault(j, {})[i] = valor
+        return MatrizEsparsa._de_linhas(self.colunas, self.linhas, resultado)
+
+    def tra(self):
+        if not self.ehquadrada():
+            raise NotImplementedError("Traço só para matrizes quadradas")
+        return sum(linha.get(i, 0.0) for i, linha in self._linhas.items())
+
+    def determinante(self):
+        if not self.ehquadrada():
+            raise ValueError("Determinante só para matrizes quadradas")
+        return self._densa().determinante()
 
     def imprimir(self):
-        print(f"Matriz {self.nome} - {self.tipo()} {self.linhas}x{self.colunas}")
+        self._imprimir_denso()
+
+
+class MatrizPreguicosa(MatrizABC):
+    # Soma, subtração, escalar e transposta são lineares, então qualquer cadeia
+    # delas vira uma combinação sum(coef * folha), com a folha possivelmente
+    # transposta. Nada é calculado até avaliar() ou getelemento().
+    def __init__(self, linhas: int, colunas: int, termos, nome: str = ""):
+        super().__init__(linhas, colunas, nome)
+        self._termos = self._agrupar(termos)
+
+    @staticmethod
+    def _agrupar(termos):
+        agrupados = {}
+        for coef, matriz, transposta in termos:
+            chave = (id(matriz), transposta)
+            if chave in agrupados:
+                anterior = agrupados[chave]
+                agrupados[chave] = (anterior[0] + coef, matriz, transposta)
+            else:
+                agrupados[chave] = (coef, matriz, transposta)
+        return [termo for termo in agrupados.values() if termo[0] != 0]
+
+    def _termos_de(self, other, sinal):
+        if isinstance(other, MatrizPreguicosa):
+            return [(sinal * coef, matriz, transposta) for coef, matriz, transposta in other._termos]
+        return [(sinal, other, False)]
+
+    def add(self, other):
+        self._checar_dimensoes(other, "soma")
+        return MatrizPreguicosa(self.linhas, self.colunas, self._termos + self._termos_de(other, 1.0))
+
+    def sub(self, other):
+        self._checar_dimensoes(other, "subtração")
+        return MatrizPreguicosa(self.linhas, self.colunas, self._termos + self._termos_de(other, -1.0))
+
+    def mul(self, other):
+        if isinstance(other, (int, float)):
+            return MatrizPreguicosa(self.linhas, self.colunas,
+                                    [(coef * other, matriz, transposta) for coef, matriz, transposta in self._termos])
+        elif isinstance(other, MatrizABC):
+            if self.colunas != other.linhas:
+                raise ValueError("Dimensões incompatíveis para multiplicação")
+            if isinstance(other, MatrizPreguicosa):
+                other = other.avaliar()
+            return self.avaliar().mul(other).preguicosa()
+        else:
+            raise TypeError("Multiplicação inválida")
+
+    def transposta(self):
+        return MatrizPreguicosa(self.colunas, self.linhas,
+                                [(coef, matriz, not transposta) for coef, matriz, transposta in self._termos],
+                                self.nome)
+
+    def getelemento(self, i, j):
+        if not (0 <= i < self.linhas and 0 <= j < self.colunas):
+            raise IndexError("Posição fora da matriz")
+        soma = 0.0
+        for coef, matriz, transposta in self._termos:
+            soma += coef * (matriz.getelemento(j, i) if transposta else matriz.getelemento(i, j))
+        return soma
+
+    def _densa(self):
+        return self.avaliar()
+
+    def _folhas_densas(self):
+        folhas = []
+        for coef, matriz, transposta in self._termos:
+            if not isinstance(matriz, MatrizGeral):
+                matriz = matriz._densa()
+            folhas.append((coef, matriz, transposta))
+        return folhas
+
+    def avaliar(self):
+        folhas = self._folhas_densas()
+        if not folhas:
+            return MatrizGeral(self.linhas, self.colunas, nome=self.nome)
+        if np is not None:
+            resultado = None
+            for coef, matriz, transposta in folhas:
+                parcela = matriz._numpy().T if transposta else matriz._numpy()
+                parcela = parcela * coef if coef != 1 else parcela
+                resultado = parcela.copy() if resultado is None else resultado + parcela
+            return MatrizGeral._de_plano(self.linhas, self.colunas, resultado, self.nome)
+        # uma passada por linha de saída, somando todas as folhas de uma vez
+        fontes = [(coef, matriz._plano(), matriz.colunas, transposta) for coef, matriz, transposta in folhas]
+        plano = array('d')
         for i in range(self.linhas):
-            linha = []
-            for j in range(self.colunas):
-                linha.append(f"{self.dados[i][j]:.2f}")
-            print(" ".join(linha))
+            linha = None
+            for coef, fonte, largura, transposta in fontes:
+                valores = fonte[i::largura] if transposta else fonte[i * largura:(i + 1) * largura]
+                if coef != 1:
+                    valores = map(operator.mul, repeat(coef), valores)
+                linha = list(valores) if linha is None else list(map(operator.add, linha, valores))
+            plano.extend(linha)
+        return MatrizGeral._de_plano(self.linhas, self.colunas, plano, self.nome)
+
+    def imprimir(self):
+        self.avaliar().imprimir()
+
+
+class LoteDeMatrizes:
+    # N matrizes de mesma forma em um único buffer, uma após a outra; os
+    # kernels percorrem a mesma posição (i, j) de todas as matrizes de uma vez
+    def __init__(self, linhas: int, colunas: int, matrizes=None, nome: str = ""):
+        self.linhas = linhas
+        self.colunas = colunas
+        self.nome = nome
+        plano = array('d')
+        self.quantidade = 0
+        for matriz in matrizes or []:
+            self.quantidade += 1
+            if isinstance(matriz, MatrizABC):
+                if matriz.linhas != linhas or matriz.colunas != colunas:
+                    raise ValueError("Dimensões incompatíveis com o lote")
+                if not isinstance(matriz, MatrizGeral):
+                    matriz = matriz._densa()
+                plano.extend(matriz._plano())
+            else:
+                if len(matriz) != linhas or any(len(linha) != colunas for linha in matriz):
+                    raise ValueError("Dimensões incompatíveis com o lote")
+                for linha in matriz:
+                    plano.extend(linha)
+        self.dados = TypedIndexedArray.from_array(plano)
+
+    @classmethod
+    def _de_plano(cls, quantidade, linhas, colunas, plano, nome=""):
+        if np is not None and isinstance(plano, np.ndarray):
+            buffer = array('d')
+            buffer.frombytes(memoryview(np.ascontiguousarray(plano, dtype=np.float64).reshape(-1)).cast('B'))
+            plano = buffer
+        lote = cls.__new__(cls)
+        lote.linhas = linhas
+        lote.colunas = colunas
+        lote.nome = nome
+        lote.quantidade = quantidade
+        lote.dados = TypedIndexedArray.from_array(plano)
+        return lote
+
+    def _plano(self):
+        return self.dados.as_memoryview()
+
+    def _numpy(self):
+        return np.frombuffer(self._plano(), dtype=np.float64).reshape(self.quantidade, self.linhas, self.colunas)
+
+    def __len__(self):
+        return self.quantidade
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += self.quantidade
+        if not 0 <= indice < self.quantidade:
+            raise IndexError("Índice fora do lote")
+        # visão sobre o buffer do lote: alterações aparecem nos dois lados
+        tamanho = self.linhas * self.colunas
+        matriz = MatrizGeral.__new__(MatrizGeral)
+        MatrizABC.__init__(matriz, self.linhas, self.colunas, f"{self.nome}[{indice}]")
+        matriz._lu = None
+        matriz._guardar_lu = False
+        matriz.dados = TypedIndexedArray.from_buffer('d', self._plano()[indice * tamanho:(indice + 1) * tamanho])
+        return matriz
+
+    def __iter__(self):
+        for indice in range(self.quantidade):
+            yield self[indice]
+
+    def _combinar(self, other, funcao, operacao):
+        if isinstance(other, LoteDeMatrizes):
+            if (other.quantidade, other.linhas, other.colunas) != (self.quantidade, self.linhas, self.colunas):
+                raise ValueError(f"Dimensões incompatíveis para {operacao}")
+            if np is not None:
+                return self._de_plano(self.quantidade, self.linhas, self.colunas,
+                                      funcao(self._numpy(), other._numpy()))
+            plano = array('d', map(funcao, self._plano(), other._plano()))
+            return self._de_plano(self.quantidade, self.linhas, self.colunas, plano)
+        if not isinstance(other, MatrizABC):
+            raise TypeError("Operação somente entre lotes ou matrizes")
+        if other.linhas != self.linhas or other.colunas != self.colunas:
+            raise ValueError(f"Dimensões incompatíveis para {operacao}")
+        if not isinstance(other, MatrizGeral):
+            other = other._densa()
+        # a mesma matriz aplicada a todo o lote
+        if np is not None:
+            return self._de_plano(self.quantidade, self.linhas, self.colunas, funcao(self._numpy(), other._numpy()))
+        a = self._plano()
+        tamanho = self.linhas * self.colunas
+        plano = array('d', bytes(8 * len(a)))
+        for posicao, valor in enumerate(other._plano()):
+            plano[posicao::tamanho] = array('d', map(funcao, a[posicao::tamanho], repeat(valor)))
+        return self._de_plano(self.quantidade, self.linhas, self.colunas, plano)
+
+    def add(self, other):
+        return self._combinar(other, operator.add, "soma")
+
+    def sub(self, other):
+        return self._combinar(other, operator.sub, "subtração")
+
+    def mul(self, other):
+        if isinstance(other, (int, float)):
+            if np is not None:
+                return self._de_plano(self.quantidade, self.linhas, self.colunas, self._numpy() * other)
+            plano = array('d', map(operator.mul, self._plano(), repeat(other)))
+            return self._de_plano(self.quantidade, self.linhas, self.colunas, plano)
+        if isinstance(other, LoteDeMatrizes):
+            if other.quantidade != self.quantidade or other.linhas != self.colunas:
+                raise ValueError("Dimensões incompatíveis para multiplicação")
+        elif isinstance(other, MatrizABC):
+            if other.linhas != self.colunas:
+                raise ValueError("Dimensões incompatíveis para multiplicação")
+            if not isinstance(other, MatrizGeral):
+                other = other._densa()
+        else:
+            raise TypeError("Multiplicação somente por escalar, lote ou matriz")
+        m, n, p = self.linhas, self.colunas, other.colunas
+        if np is not None:
+            return self._de_plano(self.quantidade, m, p, self._numpy() @ other._numpy())
+        a = self._plano()
+        b = other._plano()
+        em_lote = isinstance(other, LoteDeMatrizes)
+        plano = array('d', bytes(8 * self.quantidade * m * p))
+        for i in range(m):
+            for j in range(p):
+                acumulado = None
+                for k in range(n):
+                    if em_lote:
+                        parcela = map(operator.mul, a[i * n + k::m * n], b[k * p + j::n * p])
+                    else:
+                        parcela = map(operator.mul, a[i * n + k::m * n], repeat(b[k * p + j]))
+                    acumulado = list(parcela) if acumulado is None else list(map(operator.add, acumulado, parcela))
+                if acumulado is not None:
+                    plano[i * p + j::m * p] = array('d', acumulado)
+        return self._de_plano(self.quantidade, m, p, plano)
+
+    def transposta(self):
+        m, n = self.linhas, self.colunas
+        if np is not None:
+            return self._de_plano(self.quantidade, n, m, self._numpy().transpose(0, 2, 1))
+        a = self._plano()
+        plano = array('d', bytes(8 * len(a)))
+        for i in range(m):
+            for j in range(n):
+                plano[j * m + i::m * n] = array('d', a[i * n + j::m * n])
+        return self._de_plano(self.quantidade, n, m, plano)
+
+    def imprimir(self):
+        print(f"Lote {self.nome} - {self.quantidade} matrizes {self.linhas}x{self.colunas}")
+        for matriz in self:
+            matriz.imprimir()
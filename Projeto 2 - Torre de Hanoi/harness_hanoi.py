@@ -0,0 +1,138 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from torre_hanoi import Pilha, torre_de_hanoi
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+CAMPOS = ("n", "armazenamento", "validar", "repeticao", "movimentos", "segundos",
+          "movimentos_por_segundo", "pico_memoria_kb", "correto", "pid")
+
+
+def _pico_memoria_kb():
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # o Linux informa em KB, o macOS em bytes
+    return pico // 1024 if sys.platform == "darwin" else pico
+
+
+def estado_final_correto(pinos, n):
+    # todos os discos no pino 2, do menor (topo) ao maior (base)
+    return pinos[0].pilha_esta_vazia() and pinos[1].pilha_esta_vazia() and list(pinos[2]) == list(range(1, n + 1))
+
+
+def executar_instancia(n, armazenamento="lista", validar=True, repeticao=0):
+    pinos = [Pilha('i', n, armazenamento, validar) for _ in range(3)]
+    for disco in range(n, 0, -1):
+        pinos[0].empilha(disco)
+    contador = [0]
+
+    inicio = time.perf_counter()
+    torre_de_hanoi(n, 0, 2, 1, pinos, contador, 0)
+    segundos = time.perf_counter() - inicio
+
+    return {
+        "n": n,
+        "armazenamento": armazenamento,
+        "validar": validar,
+        "repeticao": repeticao,
+        "movimentos": contador[0],
+        "segundos": segundos,
+        "movimentos_por_segundo": contador[0] / segundos if segundos else 0.0,
+        "pico_memoria_kb": _pico_memoria_kb(),
+        "correto": contador[0] == (1 << n) - 1 and estado_final_correto(pinos, n),
+        "pid": os.getpid(),
+    }
+
+
+def executar_harness(casos, trabalhadores=None):
+    # cada instância roda em um processo novo para que o pico de memória
+    # medido seja só dela
+    trabalhadores = trabalhadores or os.cpu_count() or 1
+    resultados = []
+    with ProcessPoolExecutor(max_workers=trabalhadores, max_tasks_per_child=1) as executor:
+        tarefas = [executor.submit(executar_instancia, *caso) for caso in casos]
+        for tarefa in as_completed(tarefas):
+            resultados.append(tarefa.result())
+    resultados.sort(key=lambda r: (r["n"], r["armazenamento"], not r["validar"], r["repeticao"]))
+    return resultados
+
+
+def salvar_json(resultados, caminho, resumo=None):
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump({"resumo": resumo or {}, "resultados": resultados}, arquivo, ensure_ascii=False, indent=2)
+
+
+def salvar_csv(resultados, caminho):
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.DictWriter(arquivo, fieldnames=CAMPOS)
+        escritor.writeheader()
+        escritor.writerows(resultados)
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Carga de CPU com várias torres de Hanoi em paralelo")
+    parser.add_argument("-n", "--discos", type=int, nargs="+", default=[16, 18, 20],
+                        help="números de discos a resolver")
+    parser.add_argument("-a", "--armazenamentos", nargs="+", choices=("lista", "array"),
+                        default=["lista", "array"], help="armazenamentos de Pilha a comparar")
+    parser.add_argument("--sem-validacao", action="store_true",
+                        help="também roda cada caso com a validação de tipos desligada")
+    parser.add_argument("-r", "--repeticoes", type=int, default=1, help="execuções de cada caso")
+    parser.add_argument("-t", "--trabalhadores", type=int, help="processos em paralelo (padrão: todos os núcleos)")
+    parser.add_argument("--json", help="arquivo de saída em JSON")
+    parser.add_argument("--csv", help="arquivo de saída em CSV")
+    return parser.parse_args()
+
+
+def main():
+    argumentos = ler_argumentos()
+    validacoes = (True, False) if argumentos.sem_validacao else (True,)
+    casos = [(n, armazenamento, validar, repeticao)
+             for n in argumentos.discos
+             for armazenamento in argumentos.armazenamentos
+             for validar in validacoes
+             for repeticao in range(argumentos.repeticoes)]
+    trabalhadores = argumentos.trabalhadores or os.cpu_count() or 1
+
+    inicio = time.perf_counter()
+    resultados = executar_harness(casos, trabalhadores)
+    duracao = time.perf_counter() - inicio
+
+    movimentos = sum(r["movimentos"] for r in resultados)
+    resumo = {
+        "instancias": len(resultados),
+        "trabalhadores": trabalhadores,
+        "segundos": duracao,
+        "movimentos": movimentos,
+        "movimentos_por_segundo": movimentos / duracao if duracao else 0.0,
+        "incorretos": sum(not r["correto"] for r in resultados),
+    }
+
+    for r in resultados:
+        memoria = "-" if r["pico_memoria_kb"] is None else f"{r['pico_memoria_kb']} KB"
+        print(f"n={r['n']:<3} {r['armazenamento']:<6} {'validar' if r['validar'] else 'direto':<8} "
+              f"{r['segundos']:8.3f} s {r['movimentos_por_segundo']:>13,.0f} mov/s  {memoria:>10}  "
+              f"{'ok' if r['correto'] else 'ERRO'}")
+    print(f"{resumo['instancias']} instâncias em {duracao:.3f} s com {trabalhadores} processos "
+          f"({resumo['movimentos_por_segundo']:,.0f} movimentos/s no total)")
+
+    if argumentos.json:
+        salvar_json(resultados, argumentos.json, resumo)
+    if argumentos.csv:
+        salvar_csv(resultados, argumentos.csv)
+    if resumo["incorretos"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,12 @@
-from linear_structures import SinglyLinkedList
+import argparse
+import sys
+import time
+from array import typecodes
+from linear_structures import SinglyLinkedList, TypedIndexedArray
+
+BITS_POR_BLOCO = 10
+# 'u' foi substituído por 'w' nas versões novas do Python
+CODIGO_CARACTERE = 'w' if 'w' in typecodes else 'u'
 
 class PilhaCheiaErro(Exception):
     pass
@@ -10,28 +18,61 @@ class TipoErro(Exception):
     pass
 
 class Pilha:
-    def __init__(self, tipo: str, capacidade: int):
+    def __init__(self, tipo: str, capacidade: int, armazenamento: str = "lista", validar: bool = True):
         if tipo not in ('i', 'u'):
             raise TipoErro("Tipo deve ser 'i' para inteiro ou 'u' para caractere")
         self._tipo = tipo
         self._capacidade = capacidade
-        self._dados = SinglyLinkedList()  # substitui array por lista encadeada simples
+        self._validar = validar
+        if armazenamento == "lista":
+            self._dados = SinglyLinkedList()  # substitui array por lista encadeada simples
+            # topo no início da lista
+            self._inserir_topo = self._dados.insert_start
+            self._remover_topo = self._dados.remove_start
+        elif armazenamento == "array":
+            # buffer tipado pré-alocado, topo no fim: sem um objeto por disco
+            self._dados = TypedIndexedArray('i' if tipo == 'i' else CODIGO_CARACTERE, capacity=max(1, capacidade))
+            self._inserir_topo = self._dados.insert_end
+            self._remover_topo = self._dados.remove_end
+        else:
+            raise ValueError("Armazenamento deve ser 'lista' ou 'array'")
+        self.armazenamento = armazenamento
+        self._observadores = None
+
+    def adicionar_observador(self, observador):
+        # observador(evento, dado), com evento 'empilha' ou 'desempilha'
+        if self._observadores is None:
+            self._observadores = []
+        self._observadores.append(observador)
+
+    def remover_observador(self, observador):
+        self._observadores.remove(observador)
+        if not self._observadores:
+            self._observadores = None
+
+    def _notificar(self, evento, dado):
+        for observador in self._observadores:
+            observador(evento, dado)
     
     def empilha(self, dado):
-        if self.pilha_esta_cheia():
+        if self._dados.size == self._capacidade:
             raise PilhaCheiaErro("A pilha está cheia")
-        if self._tipo == 'i' and not isinstance(dado, int):
-            raise TipoErro("Dado deve ser inteiro")
-        if self._tipo == 'u' and not (isinstance(dado, str) and len(dado) == 1):
-            raise TipoErro("Dado deve ser caractere único")
-        self._dados.insert_start(dado)
+        if self._validar:
+            if self._tipo == 'i' and not isinstance(dado, int):
+                raise TipoErro("Dado deve ser inteiro")
+            if self._tipo == 'u' and not (isinstance(dado, str) and len(dado) == 1):
+                raise TipoErro("Dado deve ser caractere único")
+        self._inserir_topo(dado)
+        if self._observadores is not None:
+            self._notificar('empilha', dado)
     
     def desempilha(self):
-        if self.pilha_esta_vazia():
+        if self._dados.size == 0:
             raise PilhaVaziaErro("A pilha está vazia")
-        topo = self._dados.find_start()
-        self._dados.remove_start()
-        return topo
+        dado = self._remover_topo()
+        if self._observadores is not None:
+            self._notificar('desempilha', dado)
+        return dado
     
     def pilha_esta_vazia(self):
         return self._dados.is_empty()
@@ -42,94 +83,236 @@ class Pilha:
     def troca(self):
         if self.tamanho() < 2:
             raise PilhaVaziaErro("Não há elementos suficientes para trocar")
-        first = self._dados.head
-        second = first.next
-        first.next = second.next
-        second.next = first
-        self._dados.head = second
+        primeiro = self.desempilha()
+        segundo = self.desempilha()
+        self._inserir_topo(primeiro)
+        self._inserir_topo(segundo)
+        if self._observadores is not None:
+            self._notificar('empilha', primeiro)
+            self._notificar('empilha', segundo)
     
     def tamanho(self):
         return self._dados.length()
     
+    def __len__(self):
+        return self._dados.length()
+    
+    def __iter__(self):
+        # do topo para a base
+        if self.armazenamento == "array":
+            return reversed(self._dados)
+        return iter(self._dados)
+    
     def __str__(self):
-        elementos = []
-        current = self._dados.head
-        while current:
-            elementos.append(str(current.data))
-            current = current.next
+        elementos = [str(dado) for dado in self]
         elementos.reverse()
         return "[ " + " ".join(elementos) + " ]"
 
 
+class RenderizadorTorre:
+    # guarda as larguras dos discos de cada pino (base -> topo) e as linhas já
+    # montadas; observa os pinos, e cada empilha/desempilha só invalida o
+    # nível que mudou
+    def __init__(self, pinos, n, ansi=False, saida=None):
+        self.n = n
+        self.ansi = ansi
+        self.saida = saida if saida is not None else sys.stdout
+        largura_max = n + 2  # largura máxima do disco para alinhamento
+        self._segmentos = [" " * (largura_max - tam) + "#" * tam + "|" + "#" * tam + " " * (largura_max - tam) + "   "
+                           for tam in range(n + 1)]
+        self._base = ("_" * (largura_max * 2 + 1) + "   ") * len(pinos)
+        self._larguras = []
+        self._observados = []
+        for pino in pinos:
+            elementos = list(pino)
+            elementos.reverse()
+            self._larguras.append(elementos)
+            observador = self._observador(elementos)
+            pino.adicionar_observador(observador)
+            self._observados.append((pino, observador))
+        self._linhas = [None] * n
+        self._sujas = set(range(n))
+        self._desenhado = False
+
+    def _observador(self, elementos):
+        def atualizar(evento, dado):
+            if evento == 'empilha':
+                self._sujas.add(len(elementos))
+                elementos.append(dado)
+            else:
+                elementos.pop()
+                self._sujas.add(len(elementos))
+        return atualizar
+
+    def desconectar(self):
+        for pino, observador in self._observados:
+            pino.remover_observador(observador)
+        self._observados = []
+
+    def _atualizar_linhas(self):
+        vazio = self._segmentos[0]
+        for nivel in self._sujas:
+            self._linhas[nivel] = "".join(self._segmentos[elementos[nivel]] if len(elementos) > nivel else vazio
+                                          for elementos in self._larguras)
+        sujas = self._sujas
+        self._sujas = set()
+        return sujas
+
+    def quadro(self, movimentos):
+        sujas = self._atualizar_linhas()
+        cabecalho = f"Posição: {movimentos} passos"
+        if self.ansi and self._desenhado:
+            # reposiciona o cursor só nas linhas alteradas (cabeçalho na linha 2,
+            # nível mais alto na linha 4) e volta para baixo da base
+            partes = [f"\x1b[2;1H{cabecalho}\x1b[K"]
+            for nivel in sujas:
+                partes.append(f"\x1b[{4 + self.n - 1 - nivel};1H{self._linhas[nivel]}\x1b[K")
+            partes.append(f"\x1b[{5 + self.n};1H\x1b[J")
+            return "".join(partes)
+        self._desenhado = True
+        texto = "\n" + cabecalho + "\n\n" + "".join(linha + "\n" for linha in reversed(self._linhas)) + self._base + "\n"
+        return "\x1b[2J\x1b[H" + texto if self.ansi else texto
+
+    def imprimir(self, movimentos):
+        self.saida.write(self.quadro(movimentos))
+        self.saida.flush()
+
+
 def imprimir_torre_visual(pinos, movimentos, n):
-    print(f"\nPosição: {movimentos} passos\n")
+    renderizador = RenderizadorTorre(pinos, n)
+    renderizador.imprimir(movimentos)
+    renderizador.desconectar()
 
-    altura = n
-    largura_max = n + 2  # largura máxima do disco para alinhamento
 
-    for nivel in range(altura - 1, -1, -1):
-        linha = ""
-        for pino in pinos:
-            if pino.tamanho() > nivel:
-                elementos = []
-                current = pino._dados.head
-                while current:
-                    elementos.append(current.data)
-                    current = current.next
-                elementos.reverse()
-                disco = elementos[nivel]
-                tam = disco
-                lado = "#" * tam
-                espaço = " " * (largura_max - tam)
-                linha += espaço + lado + "|" + lado + espaço + "   "
-            else:
-                linha += " " * largura_max + "|" + " " * largura_max + "   "
-        print(linha)
+def movimentos_hanoi(n, origem=0, destino=2, auxiliar=1):
+    # k-ésimo movimento (k = 1 .. 2^n - 1): o disco é o bit menos significativo
+    # de k e os pinos são (k & (k-1)) % 3 -> ((k | (k-1)) + 1) % 3; com n par a
+    # fórmula leva a torre ao pino 1, por isso destino e auxiliar trocam de lugar
+    pinos = (origem, auxiliar, destino) if n % 2 else (origem, destino, auxiliar)
+    bloco = 1 << min(n, BITS_POR_BLOCO)
+    # dentro de cada bloco os movimentos se repetem com os pinos girados por
+    # (início do bloco) % 3, então bastam três tabelas pré-calculadas
+    tabelas = [[((k & -k).bit_length(), pinos[(giro + (k & (k - 1))) % 3], pinos[(giro + (k | (k - 1)) + 1) % 3])
+                for k in range(1, bloco)]
+               for giro in range(3)]
+    for inicio in range(0, 1 << n, bloco):
+        if inicio:
+            yield ((inicio & -inicio).bit_length(), pinos[(inicio & (inicio - 1)) % 3],
+                   pinos[((inicio | (inicio - 1)) + 1) % 3])
+        yield from tabelas[inicio % 3]
+
 
-    base = ""
-    for _ in pinos:
-        base += "_" * (largura_max * 2 + 1) + "   "
-    print(base)
+def estado_hanoi(n, k, origem=0, destino=2, auxiliar=1):
+    # pino de cada disco (índice 0 = disco 1) após k movimentos, do maior para
+    # o menor: o disco d só sai da origem no movimento 2^(d-1), e a partir daí
+    # os menores refazem o subproblema do auxiliar para o destino
+    if not 0 <= k < 1 << n:
+        raise ValueError(f"Movimento deve estar entre 0 e {(1 << n) - 1}")
+    posicoes = [0] * n
+    for disco in range(n, 0, -1):
+        metade = 1 << (disco - 1)
+        if k < metade:
+            posicoes[disco - 1] = origem
+            destino, auxiliar = auxiliar, destino
+        else:
+            posicoes[disco - 1] = destino
+            k -= metade
+            origem, auxiliar = auxiliar, origem
+    return posicoes
+
+
+def pinos_no_movimento(n, k, origem=0, destino=2, auxiliar=1, armazenamento="lista"):
+    pinos = [Pilha('i', n, armazenamento) for _ in range(3)]
+    posicoes = estado_hanoi(n, k, origem, destino, auxiliar)
+    for disco in range(n, 0, -1):
+        pinos[posicoes[disco - 1]].empilha(disco)
+    return pinos
 
 
-def torre_de_hanoi(n, origem, destino, auxiliar, pinos, contador, m):
-    if n == 1:
-        disco = pinos[origem].desempilha()
-        pinos[destino].empilha(disco)
+def torre_de_hanoi(n, origem, destino, auxiliar, pinos, contador, m, pausar=True, renderizador=None):
+    proprio = m and renderizador is None
+    if proprio:
+        renderizador = RenderizadorTorre(pinos, sum(p.tamanho() for p in pinos))
+    for _, de, para in movimentos_hanoi(n, origem, destino, auxiliar):
+        disco = pinos[de].desempilha()
+        pinos[para].empilha(disco)
         contador[0] += 1
 
-        if contador[0] % m == 0:
-            imprimir_torre_visual(pinos, contador[0], sum(p.tamanho() for p in pinos))
-            input("Pressione [ENTER] para continuar...")
-    else:
-        torre_de_hanoi(n-1, origem, auxiliar, destino, pinos, contador, m)
-        torre_de_hanoi(1, origem, destino, auxiliar, pinos, contador, m)
-        torre_de_hanoi(n-1, auxiliar, destino, origem, pinos, contador, m)
+        if m and contador[0] % m == 0:
+            renderizador.imprimir(contador[0])
+            if pausar:
+                input("Pressione [ENTER] para continuar...")
+    if proprio:
+        renderizador.desconectar()
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Torre de Hanoi com três pilhas")
+    parser.add_argument("-n", "--discos", type=int, help="número de discos (se omitido, é perguntado)")
+    parser.add_argument("-m", "--intervalo", type=int,
+                        help="movimentos entre exibições; 0 não exibe nada (padrão 1)")
+    parser.add_argument("--sem-pausa", action="store_true", help="não espera [ENTER] entre exibições")
+    parser.add_argument("-k", "--movimento", type=int,
+                        help="exibe direto a posição após esse movimento, sem resolver")
+    parser.add_argument("--armazenamento", choices=("lista", "array"), default="lista",
+                        help="pilhas em lista encadeada ou em array tipado pré-alocado")
+    parser.add_argument("--sem-validacao", action="store_true",
+                        help="não confere o tipo de cada disco empilhado")
+    parser.add_argument("--ansi", action="store_true",
+                        help="redesenha no lugar só as linhas que mudaram (terminais ANSI)")
+    return parser
 
 
 def main():
-    n = int(input("Digite o número de discos: "))
-    m_str = input("Digite a quantidade de movimentos entre exibições (padrão 1): ")
-    m = int(m_str) if m_str.strip() else 1
+    parser = criar_parser()
+    argumentos = parser.parse_args()
+    if argumentos.discos is None:
+        n = int(input("Digite o número de discos: "))
+    else:
+        n = argumentos.discos
+
+    if argumentos.movimento is not None:
+        # o modo de busca só desenha uma posição, então não há intervalo a perguntar
+        if not 0 <= argumentos.movimento < 1 << n:
+            parser.error(f"--movimento deve estar entre 0 e {(1 << n) - 1} para {n} discos")
+        imprimir_torre_visual(pinos_no_movimento(n, argumentos.movimento, armazenamento=argumentos.armazenamento),
+                              argumentos.movimento, n)
+        return
+
+    if argumentos.intervalo is None and argumentos.discos is None:
+        m_str = input("Digite a quantidade de movimentos entre exibições (padrão 1): ")
+        m = int(m_str) if m_str.strip() else 1
+    else:
+        m = 1 if argumentos.intervalo is None else argumentos.intervalo
 
-    pino_inicial = Pilha('i', n)
-    pino_intermediario = Pilha('i', n)
-    pino_destino = Pilha('i', n)
+    validar = not argumentos.sem_validacao
+    pino_inicial = Pilha('i', n, argumentos.armazenamento, validar)
+    pino_intermediario = Pilha('i', n, argumentos.armazenamento, validar)
+    pino_destino = Pilha('i', n, argumentos.armazenamento, validar)
 
     for disco in range(n, 0, -1):
         pino_inicial.empilha(disco)
 
     pinos = [pino_inicial, pino_intermediario, pino_destino]
 
-    print("\nPosição Inicial: 0 passos")
-    imprimir_torre_visual(pinos, 0, n)
+    renderizador = RenderizadorTorre(pinos, n, ansi=argumentos.ansi) if m else None
+    if m:
+        if not argumentos.ansi:
+            print("\nPosição Inicial: 0 passos")
+        renderizador.imprimir(0)
 
     contador = [0]  # contador mutável
 
-    torre_de_hanoi(n, 0, 2, 1, pinos, contador, m)
+    inicio = time.perf_counter()
+    torre_de_hanoi(n, 0, 2, 1, pinos, contador, m, pausar=not argumentos.sem_pausa, renderizador=renderizador)
+    duracao = time.perf_counter() - inicio
 
-    print(f"\nPosição Final : {contador[0]} passos")
-    imprimir_torre_visual(pinos, contador[0], n)
+    if m:
+        if not argumentos.ansi:
+            print(f"\nPosição Final : {contador[0]} passos")
+        renderizador.imprimir(contador[0])
+    taxa = contador[0] / duracao if duracao else 0.0
+    print(f"{contador[0]} movimentos em {duracao:.3f} s ({taxa:,.0f} movimentos/s)")
 
 
 if __name__ == "__main__":